@@ -3,4 +3,14 @@
 set -o errexit
 set -o nounset
 
-gunicorn config.wsgi:application --bind 0.0.0.0:8000 --workers 4 --threads 8 --timeout 60 --max-requests 30000 --max-requests-jitter 10000
+# Workers write their Prometheus samples here and /metrics sums them; leftovers of a previous run are removed.
+export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-/tmp/prometheus-multiproc}"
+rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+
+if [ "${ASGI_ENABLED:-False}" = "True" ]; then
+    # Event-loop workers: concurrency comes from async views, not threads.
+    gunicorn config.asgi:application -c config/gunicorn_conf.py --bind 0.0.0.0:8000 --workers 4 --worker-class uvicorn_worker.UvicornWorker --timeout 60 --max-requests 30000 --max-requests-jitter 10000
+else
+    gunicorn config.wsgi:application -c config/gunicorn_conf.py --bind 0.0.0.0:8000 --workers 4 --threads 8 --timeout 60 --max-requests 30000 --max-requests-jitter 10000
+fi
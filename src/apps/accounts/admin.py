@@ -6,6 +6,36 @@ from apps.accounts.models.auth import TokenBlacklist
 from apps.accounts.models.object_permission import RoleObjectPermission, UserObjectPermission
 from apps.accounts.models.rbac import Permission, Role, RolePermission, UserRole
 from apps.accounts.models.user import User
+from apps.accounts.services.rbac_service import on_role_permissions_changed, on_user_roles_changed
+from apps.accounts.utils.permission_registry import invalidate_permission_registry
+from apps.accounts.utils.user_snapshot import invalidate_user_snapshot
+
+
+class EffectivePermissionSyncMixin:
+    """
+    Resync user_effective_permissions for what an admin edit can affect, once per save or delete.
+
+    Subclasses implement prepare_sync(objs, form=None), which collects the scope (previous values from the form
+    included) and returns the callable that runs the sync. Deletes call it before deleting, while cascades still
+    leave the rows it reads; saves sync in save_related, after the inlines are saved too.
+    """
+
+    def prepare_sync(self, objs, form=None):
+        raise NotImplementedError
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        self.prepare_sync([form.instance], form)()
+
+    def delete_model(self, request, obj):
+        sync = self.prepare_sync([obj])
+        super().delete_model(request, obj)
+        sync()
+
+    def delete_queryset(self, request, queryset):
+        sync = self.prepare_sync(list(queryset))
+        super().delete_queryset(request, queryset)
+        sync()
 
 
 @admin.register(User)
@@ -33,6 +63,20 @@ class UserAdmin(BaseUserAdmin):
             readonly.append("email")
         return readonly
 
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        invalidate_user_snapshot(obj.id)
+
+    def delete_model(self, request, obj):
+        user_id = obj.id
+        super().delete_model(request, obj)
+        invalidate_user_snapshot(user_id)
+
+    def delete_queryset(self, request, queryset):
+        user_ids = list(queryset.values_list("id", flat=True))
+        super().delete_queryset(request, queryset)
+        invalidate_user_snapshot(*user_ids)
+
 
 class RolePermissionInline(admin.TabularInline):
     model = RolePermission
@@ -41,7 +85,7 @@ class RolePermissionInline(admin.TabularInline):
 
 
 @admin.register(Role)
-class RoleAdmin(admin.ModelAdmin):
+class RoleAdmin(EffectivePermissionSyncMixin, admin.ModelAdmin):
     list_display = ["name", "description", "is_system", "created_at", "updated_at"]
     list_filter = ["is_system", "created_at", "updated_at"]
     search_fields = ["name", "description"]
@@ -53,9 +97,18 @@ class RoleAdmin(admin.ModelAdmin):
         (_("Timestamps"), {"fields": ("created_at", "updated_at")}),
     )
 
+    def prepare_sync(self, roles, form=None):
+        role_ids = [role.pk for role in roles]
+        if form is not None:
+            return lambda: on_role_permissions_changed(role_ids=role_ids)
+
+        # Deleting a role cascades to its user_roles, so the users holding it are collected first.
+        user_ids = list(UserRole.objects.filter(role_id__in=role_ids).values_list("user_id", flat=True).distinct())
+        return lambda: on_user_roles_changed(*user_ids)
+
 
 @admin.register(Permission)
-class PermissionAdmin(admin.ModelAdmin):
+class PermissionAdmin(EffectivePermissionSyncMixin, admin.ModelAdmin):
     list_display = ["code", "name", "resource_type", "action", "created_at"]
     list_filter = ["resource_type", "action", "created_at"]
     search_fields = ["code", "name", "description", "resource_type"]
@@ -67,18 +120,42 @@ class PermissionAdmin(admin.ModelAdmin):
         (_("Timestamps"), {"fields": ("created_at", "updated_at")}),
     )
 
+    def prepare_sync(self, permissions, form=None):
+        permission_codes = {permission.code for permission in permissions}
+        if form is not None and form.initial.get("code"):
+            permission_codes.add(form.initial["code"])
+        return lambda: on_role_permissions_changed(permission_codes=permission_codes)
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        invalidate_permission_registry()
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        invalidate_permission_registry()
+
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        invalidate_permission_registry()
+
 
 @admin.register(RolePermission)
-class RolePermissionAdmin(admin.ModelAdmin):
+class RolePermissionAdmin(EffectivePermissionSyncMixin, admin.ModelAdmin):
     list_display = ["role", "permission", "created_at"]
     list_filter = ["role", "permission", "created_at"]
     search_fields = ["role__name", "permission__code", "permission__name"]
     autocomplete_fields = ["role", "permission"]
     readonly_fields = ["created_at", "updated_at"]
 
+    def prepare_sync(self, role_permissions, form=None):
+        role_ids = {role_permission.role_id for role_permission in role_permissions}
+        if form is not None and form.initial.get("role"):
+            role_ids.add(form.initial["role"])
+        return lambda: on_role_permissions_changed(role_ids=role_ids)
+
 
 @admin.register(UserRole)
-class UserRoleAdmin(admin.ModelAdmin):
+class UserRoleAdmin(EffectivePermissionSyncMixin, admin.ModelAdmin):
     list_display = ["user", "role", "assigned_by", "assigned_at"]
     list_filter = ["role", "assigned_at"]
     search_fields = ["user__email", "role__name", "assigned_by__email"]
@@ -90,6 +167,13 @@ class UserRoleAdmin(admin.ModelAdmin):
         (_("Timestamps"), {"fields": ("assigned_at", "created_at", "updated_at")}),
     )
 
+    def prepare_sync(self, user_roles, form=None):
+        # on_user_roles_changed also invalidates the snapshots, which carry the role ids.
+        user_ids = {user_role.user_id for user_role in user_roles}
+        if form is not None and form.initial.get("user"):
+            user_ids.add(form.initial["user"])
+        return lambda: on_user_roles_changed(*user_ids)
+
 
 @admin.register(UserObjectPermission)
 class UserObjectPermissionAdmin(admin.ModelAdmin):
@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class AccountsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.accounts"
+
+    def ready(self):
+        from django.core.signals import request_started
+
+        from apps.accounts.services.blacklist_service import blacklist_sweeper
+
+        # Started from the first request, so it runs in serving processes (after gunicorn forks),
+        # not in migrate or other management commands.
+        request_started.connect(blacklist_sweeper.start, dispatch_uid="accounts.blacklist_sweeper")
@@ -1,11 +1,65 @@
+from django.conf import settings
 from rest_framework_simplejwt.authentication import JWTAuthentication
-from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken,
+    TokenBackendError,
+    TokenBackendExpiredToken,
+    TokenError,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.state import token_backend
+from rest_framework_simplejwt.utils import get_md5_hash_password
 
-from apps.accounts.utils.jwt_utils import is_token_blacklisted
+from apps.accounts.utils.jwt_utils import ais_jti_blacklisted, is_jti_blacklisted, parse_validated_token
+from apps.accounts.utils.user_snapshot import aget_user_snapshot, get_user_snapshot, user_from_snapshot
+from apps.common.metrics import record_jwt_auth
 
 
 class CustomJWTAuthentication(JWTAuthentication):
     def authenticate(self, request):
+        validated_token = self._get_request_token(request)
+        if validated_token is None:
+            return None
+
+        # The signature is verified exactly once; the blacklist check reads jti from the validated payload.
+        if is_jti_blacklisted(parse_validated_token(validated_token).jti):
+            record_jwt_auth("blacklisted")
+            raise InvalidToken("Token is blacklisted")
+
+        try:
+            user = self.get_user(validated_token)
+        except TokenError as exc:
+            record_jwt_auth("invalid")
+            raise InvalidToken("Token is invalid or expired") from exc
+        except AuthenticationFailed as exc:
+            record_jwt_auth(exc.get_codes())
+            raise
+
+        return self._check_user(user), validated_token
+
+    async def aauthenticate(self, request):
+        """Async counterpart of authenticate() for async views: blacklist and user lookups use the async ORM."""
+        validated_token = self._get_request_token(request)
+        if validated_token is None:
+            return None
+
+        if await ais_jti_blacklisted(parse_validated_token(validated_token).jti):
+            record_jwt_auth("blacklisted")
+            raise InvalidToken("Token is blacklisted")
+
+        try:
+            user = await self.aget_user(validated_token)
+        except TokenError as exc:
+            record_jwt_auth("invalid")
+            raise InvalidToken("Token is invalid or expired") from exc
+        except AuthenticationFailed as exc:
+            record_jwt_auth(exc.get_codes())
+            raise
+
+        return self._check_user(user), validated_token
+
+    def _get_request_token(self, request):
         header = self.get_header(request)
         if header is None:
             return None
@@ -14,16 +68,66 @@ class CustomJWTAuthentication(JWTAuthentication):
         if raw_token is None:
             return None
 
-        if is_token_blacklisted(str(raw_token)):
-            raise InvalidToken("Token is blacklisted")
+        try:
+            return self.get_validated_token(raw_token)
+        except InvalidToken:
+            record_jwt_auth("expired" if self._is_expired(raw_token) else "invalid")
+            raise
 
+    def _is_expired(self, raw_token) -> bool:
+        # simplejwt reports every rejected token the same way; only the metrics need the reason,
+        # so a failed token is decoded once more to tell an expired (but genuine) one apart.
         try:
-            validated_token = self.get_validated_token(raw_token)
-            user = self.get_user(validated_token)
-        except TokenError:
-            raise InvalidToken("Token is invalid or expired")
+            token_backend.decode(raw_token, verify=True)
+        except TokenBackendExpiredToken:
+            return True
+        except TokenBackendError:
+            return False
+        return False
 
+    def _check_user(self, user):
         if not user.is_active or user.is_deleted:
+            record_jwt_auth("user_inactive")
             raise InvalidToken("User account is inactive or deleted")
+        record_jwt_auth("valid")
+        return user
+
+    def get_user(self, validated_token):
+        if not settings.JWT_USER_SNAPSHOT_ENABLED:
+            return super().get_user(validated_token)
+
+        snapshot = get_user_snapshot(self._get_user_id(validated_token))
+        if snapshot is None:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+
+        return user_from_snapshot(snapshot)
 
-        return (user, validated_token)
+    async def aget_user(self, validated_token):
+        user_id = self._get_user_id(validated_token)
+
+        if settings.JWT_USER_SNAPSHOT_ENABLED:
+            snapshot = await aget_user_snapshot(user_id)
+            if snapshot is None:
+                raise AuthenticationFailed("User not found", code="user_not_found")
+            return user_from_snapshot(snapshot)
+
+        try:
+            user = await self.user_model.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist as exc:
+            raise AuthenticationFailed("User not found", code="user_not_found") from exc
+
+        # Same checks as JWTAuthentication.get_user.
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed("The user's password has been changed.", code="password_changed")
+
+        return user
+
+    def _get_user_id(self, validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as exc:
+            raise InvalidToken("Token contained no recognizable user identification") from exc
@@ -0,0 +1,91 @@
+import copy
+import statistics
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signals
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test.utils import setup_databases, teardown_databases
+from rest_framework.test import APIRequestFactory
+
+from apps.accounts.authentication import CustomJWTAuthentication
+from apps.accounts.utils.jwt_utils import generate_tokens
+from apps.accounts.views.user import UserProfileView
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Нагрузочный тест аутентифицированного запроса (GET /users/me/): p50/p99 без переиспользования "
+        "соединений с БД и с текущим DB_CONNECTION_MODE. Запускается на временной тестовой базе"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8, help="Количество потоков (по умолчанию: 8)")
+        parser.add_argument("--requests", type=int, default=200, help="Запросов на поток (по умолчанию: 200)")
+
+    def handle(self, *args, **options):
+        # Worker threads use their own connections and can't see an uncommitted transaction, so the
+        # benchmark user has to be committed: the run goes to a throwaway test database, never the real one.
+        old_config = setup_databases(verbosity=0, interactive=False, aliases=["default"])
+        try:
+            self._benchmark(options["threads"], options["requests"])
+        finally:
+            teardown_databases(old_config, verbosity=0)
+
+    def _benchmark(self, threads_count, requests_count):
+        user = User.objects.create_user(email="benchmark-db@test.com", password=None)
+        access_token = generate_tokens(user)["access_token"]
+
+        configured = connections.settings["default"]
+        no_reuse = copy.deepcopy(configured)
+        no_reuse["CONN_MAX_AGE"] = 0
+        no_reuse["OPTIONS"].pop("pool", None)
+
+        self.stdout.write(f"Бэкенд: {configured['ENGINE']}, режим: {settings.DB_CONNECTION_MODE}")
+        for label, settings_dict in (("Без переиспользования", no_reuse), ("Текущие настройки", configured)):
+            connections.settings["default"] = settings_dict
+            try:
+                timings = self._run(access_token, threads_count, requests_count)
+            finally:
+                connections.settings["default"] = configured
+            self._report(label, timings)
+
+    def _run(self, access_token, threads_count, requests_count):
+        view = UserProfileView.as_view(authentication_classes=[CustomJWTAuthentication])
+        factory = APIRequestFactory()
+        timings = []
+        lock = threading.Lock()
+
+        def worker():
+            thread_timings = []
+            try:
+                for _ in range(requests_count):
+                    request = factory.get("/api/users/me/", HTTP_AUTHORIZATION=f"Bearer {access_token}")
+                    started = time.perf_counter()
+                    # The WSGI handler sends these signals; close_old_connections honours CONN_MAX_AGE on them.
+                    signals.request_started.send(sender=self.__class__)
+                    response = view(request)
+                    response.render()
+                    signals.request_finished.send(sender=self.__class__)
+                    thread_timings.append((time.perf_counter() - started) * 1000)
+            finally:
+                connections.close_all()
+            with lock:
+                timings.extend(thread_timings)
+
+        workers = [threading.Thread(target=worker) for _ in range(threads_count)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        return timings
+
+    def _report(self, label, timings):
+        timings.sort()
+        p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+        self.stdout.write(f"{label}: p50 {statistics.median(timings):.2f} мс, p99 {p99:.2f} мс")
@@ -0,0 +1,98 @@
+import contextlib
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.backends import TokenBackend
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.accounts.authentication import CustomJWTAuthentication
+from apps.accounts.services.auth_service import logout_user
+from apps.accounts.utils.jwt_utils import generate_tokens
+
+User = get_user_model()
+
+
+def legacy_authenticate(raw_token):
+    """Request path before the token-parsing layer: jti lookup and validation decoded separately."""
+    AccessToken(raw_token)
+    return AccessToken(raw_token)
+
+
+def legacy_logout(access_token, refresh_token):
+    """Logout before the token-parsing layer: jti and exp were decoded separately for each token."""
+    legacy_authenticate(access_token)
+    for token in (access_token, refresh_token):
+        for _ in range(2):
+            with contextlib.suppress(TokenError):
+                AccessToken(token)
+
+
+class Command(BaseCommand):
+    help = "Считает проверки подписи JWT (HMAC) на запрос до и после слоя разбора токенов"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=1000, help="Количество повторов (по умолчанию: 1000)")
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+
+        with transaction.atomic():
+            user = User.objects.create_user(email="benchmark-jwt@test.com", password=None)
+            authentication = CustomJWTAuthentication()
+            factory = APIRequestFactory()
+
+            def new_authenticate():
+                tokens = generate_tokens(user)
+                request = factory.get("/", HTTP_AUTHORIZATION=f"Bearer {tokens['access_token']}")
+                return authentication.authenticate(request)
+
+            def new_logout():
+                tokens = generate_tokens(user)
+                request = factory.get("/", HTTP_AUTHORIZATION=f"Bearer {tokens['access_token']}")
+                _, validated_token = authentication.authenticate(request)
+                logout_user(access_token=validated_token, refresh_token=tokens["refresh_token"], user=user)
+
+            def old_authenticate():
+                legacy_authenticate(generate_tokens(user)["access_token"])
+
+            def old_logout():
+                tokens = generate_tokens(user)
+                legacy_logout(tokens["access_token"], tokens["refresh_token"])
+
+            self._report("Аутентификация запроса (до)", old_authenticate, iterations)
+            self._report("Аутентификация запроса (после)", new_authenticate, iterations)
+            self._report("Logout (до)", old_logout, iterations)
+            self._report("Logout (после)", new_logout, iterations)
+            self._report_verification_cost(generate_tokens(user)["access_token"], iterations)
+
+            transaction.set_rollback(True)
+
+    def _report(self, label, func, iterations):
+        original_decode = TokenBackend.decode
+        verifications = 0
+
+        def counting_decode(backend, token, verify=True):
+            nonlocal verifications
+            verifications += 1
+            return original_decode(backend, token, verify=verify)
+
+        TokenBackend.decode = counting_decode
+        try:
+            for _ in range(iterations):
+                func()
+        finally:
+            TokenBackend.decode = original_decode
+
+        self.stdout.write(f"{label}: проверок подписи на запрос: {verifications / iterations:.1f}")
+
+    def _report_verification_cost(self, access_token, iterations):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            AccessToken(access_token)
+        elapsed_us = (time.perf_counter() - started) * 1_000_000 / iterations
+
+        self.stdout.write(f"Стоимость одной проверки подписи: {elapsed_us:.1f} мкс")
@@ -0,0 +1,104 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from apps.accounts.models.rbac import Permission, PermissionAction, Role, RolePermission, UserRole
+from apps.accounts.services.rbac_service import load_user_permission_codes, sync_effective_permissions
+from apps.common.permissions import check_permissions
+
+User = get_user_model()
+
+
+def legacy_check_permissions(user, permission_codes):
+    """Per-code loop that check_permissions replaced: three queries per code."""
+    result = {}
+    for permission_code in permission_codes:
+        try:
+            permission_obj = Permission.objects.get(code=permission_code)
+        except Permission.DoesNotExist:
+            result[permission_code] = False
+            continue
+
+        role_ids = [ur.role_id for ur in UserRole.objects.filter(user=user).select_related("role")]
+        result[permission_code] = bool(role_ids) and (
+            RolePermission.objects.filter(role_id__in=role_ids, permission=permission_obj).exists()
+        )
+    return result
+
+
+def cold_check_permissions(user, permission_codes):
+    granted_codes = load_user_permission_codes(user.id)
+    return {permission_code: permission_code in granted_codes for permission_code in permission_codes}
+
+
+class Command(BaseCommand):
+    help = "Сравнивает пакетную проверку прав (POST /permissions/check/) с поштучным циклом"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--codes", type=int, default=50, help="Количество проверяемых прав (по умолчанию: 50)")
+        parser.add_argument("--iterations", type=int, default=20, help="Количество повторов (по умолчанию: 20)")
+
+    def handle(self, *args, **options):
+        codes_count = options["codes"]
+        iterations = options["iterations"]
+
+        with transaction.atomic():
+            user, permission_codes = self._create_fixture(codes_count)
+
+            # Timing differing answers would compare nothing; every path must agree with the legacy loop.
+            expected = legacy_check_permissions(user, permission_codes)
+            for label, func in (("холодный кэш", cold_check_permissions), ("check_permissions", check_permissions)):
+                if func(user, permission_codes) != expected:
+                    raise CommandError(f"Результаты проверки ({label}) расходятся с поштучным циклом")
+
+            self._report(
+                "Цикл has_permission (до)", lambda: legacy_check_permissions(user, permission_codes), iterations
+            )
+            self._report(
+                "Один запрос, холодный кэш", lambda: cold_check_permissions(user, permission_codes), iterations
+            )
+            self._report("check_permissions, тёплый кэш", lambda: check_permissions(user, permission_codes), iterations)
+
+            transaction.set_rollback(True)
+
+    def _create_fixture(self, codes_count):
+        user = User.objects.create_user(email="benchmark-permissions@test.com", password=None)
+        role = Role.objects.create(name="benchmark-permissions")
+        UserRole.objects.create(user=user, role=role)
+
+        permissions = Permission.objects.bulk_create(
+            Permission(
+                code=f"benchmark.resource{index}.read",
+                name=f"Benchmark {index}",
+                resource_type=f"benchmark.resource{index}",
+                action=PermissionAction.READ,
+            )
+            for index in range(codes_count)
+        )
+        RolePermission.objects.bulk_create(
+            RolePermission(role=role, permission=permission) for permission in permissions[::2]
+        )
+        # bulk_create skips the model hooks, so the materialized table is filled explicitly.
+        sync_effective_permissions(user_ids=[user.id])
+
+        return user, [permission.code for permission in permissions]
+
+    def _report(self, label, func, iterations):
+        query_count = 0
+
+        def count_queries(execute, sql, params, many, context):
+            nonlocal query_count
+            query_count += 1
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count_queries):
+            func()
+
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        elapsed_ms = (time.perf_counter() - started) * 1000 / iterations
+
+        self.stdout.write(f"{label}: {elapsed_ms:.2f} мс, запросов к БД: {query_count}")
@@ -0,0 +1,38 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.accounts.services.blacklist_service import cleanup_token_blacklist
+
+
+class Command(BaseCommand):
+    help = "Удаляет истекшие токены из token_blacklist пачками (для секционированной таблицы удаляет старые секции)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.TOKEN_BLACKLIST_CLEANUP_BATCH_SIZE,
+            help=f"Строк в одном DELETE (по умолчанию: {settings.TOKEN_BLACKLIST_CLEANUP_BATCH_SIZE})",
+        )
+        parser.add_argument("--loop", action="store_true", help="Повторять очистку бесконечно (для сервиса в swarm)")
+        parser.add_argument(
+            "--interval", type=int, default=300, help="Пауза между проходами в секундах (по умолчанию: 300)"
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            result = cleanup_token_blacklist(options["batch_size"])
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Удалено строк: {result['rows_deleted']}, секций удалено: {result['partitions_dropped']}, "
+                    f"создано: {result['partitions_created']}"
+                )
+            )
+            if not options["loop"]:
+                return
+
+            time.sleep(options["interval"])
+            close_old_connections()
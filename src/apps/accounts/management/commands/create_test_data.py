@@ -3,6 +3,10 @@ from django.core.management.base import BaseCommand
 from django.db import transaction
 
 from apps.accounts.models.rbac import Permission, PermissionAction, Role, RolePermission, UserRole
+from apps.accounts.services.rbac_service import on_role_permissions_changed
+from apps.accounts.utils.permission_registry import invalidate_permission_registry
+from apps.accounts.utils.user_snapshot import invalidate_user_snapshot
+from apps.blog.models import Post
 
 User = get_user_model()
 
@@ -38,6 +42,9 @@ class Command(BaseCommand):
             self._assign_permissions_to_roles(roles, permissions)
             users = self._create_users(password)
             self._assign_roles_to_users(users, roles)
+            on_role_permissions_changed()
+            invalidate_permission_registry()
+            self._create_posts(users)
 
         self.stdout.write(self.style.SUCCESS("Тестовые данные успешно созданы!"))
 
@@ -45,7 +52,9 @@ class Command(BaseCommand):
         self.stdout.write("Удаление существующих тестовых данных...")
 
         test_emails = ["admin@test.com", "user@test.com", "moderator@test.com"]
-        User.objects.filter(email__in=test_emails).delete()
+        test_users = User.objects.filter(email__in=test_emails)
+        invalidate_user_snapshot(*test_users.values_list("id", flat=True))
+        test_users.delete()
 
         test_role_names = ["admin", "user", "moderator"]
         Role.objects.filter(name__in=test_role_names, is_system=False).delete()
@@ -182,3 +191,20 @@ class Command(BaseCommand):
             else:
                 self.stdout.write(f"  - Роль {role_name} уже назначена пользователю {email}")
 
+    def _create_posts(self, users):
+        posts_data = [
+            {"title": "Первый пост", "content": "Содержимое первого поста", "author": "admin@test.com"},
+            {"title": "Второй пост", "content": "Содержимое второго поста", "author": "user@test.com"},
+            {"title": "Третий пост", "content": "Содержимое третьего поста", "author": "moderator@test.com"},
+        ]
+
+        for post_data in posts_data:
+            post, created = Post.objects.get_or_create(
+                author=users[post_data["author"]],
+                title=post_data["title"],
+                defaults={"content": post_data["content"]},
+            )
+            if created:
+                self.stdout.write(f"  ✓ Создан пост: {post.title}")
+            else:
+                self.stdout.write(f"  - Пост уже существует: {post.title}")
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.accounts.services.blacklist_service import (
+    is_partitioned,
+    partition_token_blacklist,
+    unpartition_token_blacklist,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Переводит token_blacklist на секционирование по expires_at (только PostgreSQL): "
+        "истекшие дни удаляются целыми секциями. Таблица блокируется на время переноса. "
+        "Перед миграциями, меняющими таблицу, секционирование снимается через --revert"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--revert", action="store_true", help="Вернуть обычную таблицу в том виде, в каком ее создают миграции"
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Секционирование поддерживается только для PostgreSQL")
+
+        if options["revert"]:
+            if not is_partitioned():
+                self.stdout.write("Таблица token_blacklist не секционирована")
+                return
+            moved = unpartition_token_blacklist()
+            self.stdout.write(self.style.SUCCESS(f"Секционирование снято, перенесено токенов: {moved}"))
+            return
+
+        if is_partitioned():
+            self.stdout.write("Таблица token_blacklist уже секционирована")
+            return
+        moved = partition_token_blacklist()
+        self.stdout.write(self.style.SUCCESS(f"Таблица секционирована, перенесено действующих токенов: {moved}"))
@@ -0,0 +1,45 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.accounts.models.rbac import UserEffectivePermission
+from apps.accounts.services.rbac_service import invalidate_all_permissions, sync_effective_permissions
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Пересобирает таблицу user_effective_permissions из user_roles и role_permissions"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Количество пользователей в одной транзакции (по умолчанию: 1000)",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        rows_before = UserEffectivePermission.objects.count()
+
+        last_id = 0
+        users_processed = 0
+        while True:
+            user_ids = list(
+                User.objects.filter(id__gt=last_id).order_by("id").values_list("id", flat=True)[:batch_size]
+            )
+            if not user_ids:
+                break
+
+            with transaction.atomic():
+                sync_effective_permissions(user_ids=user_ids)
+
+            last_id = user_ids[-1]
+            users_processed += len(user_ids)
+            self.stdout.write(f"Обработано пользователей: {users_processed}")
+
+        invalidate_all_permissions()
+
+        rows_after = UserEffectivePermission.objects.count()
+        self.stdout.write(self.style.SUCCESS(f"Таблица пересобрана: строк было {rows_before}, стало {rows_after}"))
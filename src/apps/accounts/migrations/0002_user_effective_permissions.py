@@ -0,0 +1,47 @@
+# Generated by Django 5.2.3 on 2026-10-17 06:18
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_user_effective_permissions(apps, schema_editor):
+    RolePermission = apps.get_model("accounts", "RolePermission")
+    UserEffectivePermission = apps.get_model("accounts", "UserEffectivePermission")
+
+    rows = (
+        RolePermission.objects.filter(role__user_roles__isnull=False)
+        .values_list("role__user_roles__user_id", "permission__code")
+        .distinct()
+    )
+    UserEffectivePermission.objects.bulk_create(
+        [UserEffectivePermission(user_id=user_id, permission_code=code) for user_id, code in rows.iterator()],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserEffectivePermission',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('permission_code', models.CharField(max_length=200, verbose_name='permission code')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='effective_permissions', to=settings.AUTH_USER_MODEL, verbose_name='user')),
+            ],
+            options={
+                'verbose_name': 'user effective permission',
+                'verbose_name_plural': 'user effective permissions',
+                'db_table': 'user_effective_permissions',
+                'indexes': [models.Index(fields=['permission_code'], name='user_effect_permiss_2cb72c_idx')],
+                'unique_together': {('user', 'permission_code')},
+            },
+        ),
+        migrations.RunPython(populate_user_effective_permissions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-17 06:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_user_effective_permissions'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='permission',
+            name='action',
+            field=models.CharField(choices=[('create', 'Create'), ('read', 'Read'), ('update', 'Update'), ('delete', 'Delete'), ('list', 'List'), ('*', 'All')], max_length=50, verbose_name='action'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.3 on 2026-10-17 07:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_permission_action_all'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='tokenblacklist',
+            name='token_jti',
+            field=models.CharField(max_length=255, verbose_name='token jti'),
+        ),
+        migrations.AddConstraint(
+            model_name='tokenblacklist',
+            constraint=models.UniqueConstraint(fields=('token_jti', 'expires_at'), name='token_blacklist_jti_expires_uniq'),
+        ),
+    ]
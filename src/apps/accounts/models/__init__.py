@@ -1,6 +1,13 @@
 from apps.accounts.models.auth import TokenBlacklist
 from apps.accounts.models.object_permission import RoleObjectPermission, UserObjectPermission
-from apps.accounts.models.rbac import Permission, PermissionAction, Role, RolePermission, UserRole
+from apps.accounts.models.rbac import (
+    Permission,
+    PermissionAction,
+    Role,
+    RolePermission,
+    UserEffectivePermission,
+    UserRole,
+)
 from apps.accounts.models.user import User, UserManager
 
 __all__ = [
@@ -12,6 +19,7 @@ __all__ = [
     "PermissionAction",
     "RolePermission",
     "UserRole",
+    "UserEffectivePermission",
     "UserObjectPermission",
     "RoleObjectPermission",
 ]
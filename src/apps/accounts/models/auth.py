@@ -5,7 +5,7 @@ from apps.common.mixins.model_mixins import TimestampMixin
 
 
 class TokenBlacklist(TimestampMixin):
-    token_jti = models.CharField(_("token jti"), max_length=255, unique=True, db_index=True)
+    token_jti = models.CharField(_("token jti"), max_length=255)
     user = models.ForeignKey("accounts.User", on_delete=models.CASCADE, related_name="blacklisted_tokens", verbose_name=_("user"))
     expires_at = models.DateTimeField(_("expires at"))
     blacklisted_at = models.DateTimeField(_("blacklisted at"), auto_now_add=True)
@@ -14,6 +14,14 @@ class TokenBlacklist(TimestampMixin):
         verbose_name = _("token blacklist")
         verbose_name_plural = _("token blacklist")
         db_table = "token_blacklist"
+        # `partition_token_blacklist` can partition the table by expires_at on PostgreSQL, and every unique
+        # constraint of a partitioned table must include the partition key. A jti always comes with the same exp
+        # claim, so this is still one row per token. The primary key there becomes (id, expires_at), which the model
+        # doesn't describe: Django keeps treating id as the key, and it stays unique because it comes from a single
+        # sequence. Migrations that alter this table need `partition_token_blacklist --revert` first.
+        constraints = [
+            models.UniqueConstraint(fields=["token_jti", "expires_at"], name="token_blacklist_jti_expires_uniq"),
+        ]
         indexes = [
             models.Index(fields=["token_jti"]),
             models.Index(fields=["user"]),
@@ -24,12 +32,16 @@ class TokenBlacklist(TimestampMixin):
         return f"Blacklisted token {self.token_jti} for {self.user.email}"
 
     @classmethod
-    def cleanup_expired(cls):
-        from django.utils import timezone
+    def cleanup_expired(cls, batch_size=None):
+        from apps.accounts.services.blacklist_service import cleanup_token_blacklist
 
-        return cls.objects.filter(expires_at__lt=timezone.now()).delete()
+        return cleanup_token_blacklist(batch_size)
 
     @classmethod
     def is_blacklisted(cls, token_jti):
         return cls.objects.filter(token_jti=token_jti).exists()
 
+    @classmethod
+    async def ais_blacklisted(cls, token_jti):
+        return await cls.objects.filter(token_jti=token_jti).aexists()
+
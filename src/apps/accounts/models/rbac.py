@@ -11,6 +11,8 @@ class PermissionAction(models.TextChoices):
     UPDATE = "update", _("Update")
     DELETE = "delete", _("Delete")
     LIST = "list", _("List")
+    # Wildcard grants such as "blog.post.*" cover every code under their prefix.
+    ALL = "*", _("All")
 
 
 class Role(TimestampMixin):
@@ -39,10 +41,18 @@ class Role(TimestampMixin):
         return Permission.objects.filter(role_permissions__role=self).distinct()
 
     def add_permission(self, permission):
-        RolePermission.objects.get_or_create(role=self, permission=permission)
+        from apps.accounts.services.rbac_service import on_role_permissions_changed
+
+        _, created = RolePermission.objects.get_or_create(role=self, permission=permission)
+        if created:
+            on_role_permissions_changed(role_ids=[self.id], permission_codes=[permission.code])
 
     def remove_permission(self, permission):
-        self.role_permissions.filter(permission=permission).delete()
+        from apps.accounts.services.rbac_service import on_role_permissions_changed
+
+        deleted, _ = self.role_permissions.filter(permission=permission).delete()
+        if deleted:
+            on_role_permissions_changed(role_ids=[self.id], permission_codes=[permission.code])
 
 
 class Permission(TimestampMixin):
@@ -106,3 +116,22 @@ class UserRole(TimestampMixin):
     def __str__(self):
         return f"{self.user.email} -> {self.role.name}"
 
+
+class UserEffectivePermission(models.Model):
+
+    user = models.ForeignKey(
+        "accounts.User", on_delete=models.CASCADE, related_name="effective_permissions", verbose_name=_("user")
+    )
+    permission_code = models.CharField(_("permission code"), max_length=200)
+
+    class Meta:
+        verbose_name = _("user effective permission")
+        verbose_name_plural = _("user effective permissions")
+        db_table = "user_effective_permissions"
+        unique_together = [["user", "permission_code"]]
+        indexes = [
+            models.Index(fields=["permission_code"]),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} -> {self.permission_code}"
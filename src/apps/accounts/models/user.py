@@ -7,12 +7,16 @@ from apps.common.mixins.model_mixins import TimestampMixin
 
 class UserManager(BaseUserManager):
 
-    def create_user(self, email, password=None, **extra_fields):
+    def create_user(self, email, password=None, encoded_password=None, **extra_fields):
         if not email:
             raise ValueError("Email обязателен для создания пользователя")
         email = self.normalize_email(email)
         user = self.model(email=email, **extra_fields)
-        user.set_password(password)
+        if encoded_password is not None:
+            # Already hashed by the caller, e.g. in the password hashing pool.
+            user.password = encoded_password
+        else:
+            user.set_password(password)
         user.save(using=self._db)
         return user
 
@@ -65,8 +69,11 @@ class User(AbstractUser, TimestampMixin):
         self.is_active = False
         from django.utils import timezone
 
+        from apps.accounts.utils.user_snapshot import invalidate_user_snapshot
+
         self.deleted_at = timezone.now()
-        self.save(update_fields=["is_active", "deleted_at"])
+        self.save(update_fields=["is_active", "deleted_at", "updated_at"])
+        invalidate_user_snapshot(self.id)
 
     @property
     def is_deleted(self):
@@ -82,13 +89,20 @@ class User(AbstractUser, TimestampMixin):
 
     def add_role(self, role, assigned_by=None):
         from apps.accounts.models.rbac import UserRole
+        from apps.accounts.services.rbac_service import on_user_roles_changed
 
-        UserRole.objects.get_or_create(
+        _, created = UserRole.objects.get_or_create(
             user=self,
             role=role,
             defaults={"assigned_by": assigned_by},
         )
+        if created:
+            on_user_roles_changed(self.id)
 
     def remove_role(self, role):
-        self.user_roles.filter(role=role).delete()
+        from apps.accounts.services.rbac_service import on_user_roles_changed
+
+        deleted, _ = self.user_roles.filter(role=role).delete()
+        if deleted:
+            on_user_roles_changed(self.id)
 
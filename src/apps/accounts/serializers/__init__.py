@@ -4,9 +4,11 @@ from apps.accounts.serializers.admin import (
     PermissionSerializer,
     RoleCreateSerializer,
     RolePermissionAssignSerializer,
+    RolePermissionBulkSerializer,
     RolePermissionSerializer,
     RoleSerializer,
     UserRoleAssignSerializer,
+    UserRoleBulkSerializer,
     UserRoleSerializer,
 )
 from apps.accounts.serializers.auth import (
@@ -37,8 +39,10 @@ __all__ = [
     "PermissionCreateSerializer",
     "RolePermissionSerializer",
     "RolePermissionAssignSerializer",
+    "RolePermissionBulkSerializer",
     "UserRoleSerializer",
     "UserRoleAssignSerializer",
+    "UserRoleBulkSerializer",
     "AdminUserSerializer",
 ]
 
@@ -1,7 +1,9 @@
+from django.conf import settings
 from rest_framework import serializers
 
 from apps.accounts.models.rbac import Permission, PermissionAction, Role, RolePermission, UserRole
 from apps.accounts.models.user import User
+from apps.accounts.utils.permission_grants import WILDCARD, is_wildcard
 
 
 class RoleSerializer(serializers.ModelSerializer):
@@ -14,6 +16,9 @@ class RoleSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "is_system", "created_at", "updated_at"]
 
     def get_permissions_count(self, obj):
+        # List views annotate the count; single objects fall back to a query.
+        if hasattr(obj, "permissions_count"):
+            return obj.permissions_count
         return obj.get_permissions().count()
 
 
@@ -59,6 +64,8 @@ class PermissionCreateSerializer(serializers.ModelSerializer):
     def validate_code(self, value):
         if Permission.objects.filter(code=value).exists():
             raise serializers.ValidationError("Право с таким кодом уже существует")
+        if WILDCARD in value and not (is_wildcard(value) and value.count(WILDCARD) == 1):
+            raise serializers.ValidationError(f"Символ {WILDCARD} допустим только как последний сегмент кода")
         return value
 
     def validate_action(self, value):
@@ -67,6 +74,15 @@ class PermissionCreateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(f"Действие должно быть одним из: {', '.join(valid_actions)}")
         return value
 
+    def validate(self, attrs):
+        code = attrs.get("code", getattr(self.instance, "code", ""))
+        action = attrs.get("action", getattr(self.instance, "action", ""))
+        if is_wildcard(code) != (action == PermissionAction.ALL):
+            raise serializers.ValidationError(
+                {"action": f"Действие {PermissionAction.ALL.value} задаётся только для кодов вида resource.{WILDCARD}"}
+            )
+        return attrs
+
 
 class RolePermissionSerializer(serializers.ModelSerializer):
     permission_code = serializers.CharField(source="permission.code", read_only=True)
@@ -116,5 +132,73 @@ class AdminUserSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "created_at", "updated_at"]
 
     def get_roles(self, obj):
+        # UserListView prefetches user_roles with their roles, so no query per user.
+        if "user_roles" in getattr(obj, "_prefetched_objects_cache", {}):
+            return list(dict.fromkeys(user_role.role.name for user_role in obj.user_roles.all()))
         return [role.name for role in obj.get_roles()]
 
+
+
+BULK_ACTION_ASSIGN = "assign"
+BULK_ACTION_REMOVE = "remove"
+BULK_ACTIONS = [BULK_ACTION_ASSIGN, BULK_ACTION_REMOVE]
+
+
+def _missing_ids_error(label, requested_ids, found_ids):
+    missing_ids = sorted(set(requested_ids) - set(found_ids))
+    if missing_ids:
+        preview = ", ".join(map(str, missing_ids[:20]))
+        raise serializers.ValidationError(f"{label} не найдены: {preview}" + (" ..." if len(missing_ids) > 20 else ""))
+
+
+class UserRolePairSerializer(serializers.Serializer):
+    user_id = serializers.IntegerField(required=True)
+    role_id = serializers.IntegerField(required=True)
+
+
+class RolePermissionPairSerializer(serializers.Serializer):
+    role_id = serializers.IntegerField(required=True)
+    permission_id = serializers.IntegerField(required=True)
+
+
+class UserRoleBulkSerializer(serializers.Serializer):
+    action = serializers.ChoiceField(choices=BULK_ACTIONS)
+    items = serializers.ListField(child=UserRolePairSerializer(), allow_empty=False)
+
+    def validate_items(self, value):
+        if len(value) > settings.RBAC_BULK_MAX_ITEMS:
+            raise serializers.ValidationError(f"Не больше {settings.RBAC_BULK_MAX_ITEMS} элементов за запрос")
+
+        user_ids = {item["user_id"] for item in value}
+        role_ids = {item["role_id"] for item in value}
+        _missing_ids_error(
+            "Пользователи",
+            user_ids,
+            User.objects.filter(id__in=user_ids, is_active=True, deleted_at__isnull=True).values_list("id", flat=True),
+        )
+        _missing_ids_error("Роли", role_ids, Role.objects.filter(id__in=role_ids).values_list("id", flat=True))
+
+        return list(dict.fromkeys((item["user_id"], item["role_id"]) for item in value))
+
+
+class RolePermissionBulkSerializer(serializers.Serializer):
+    action = serializers.ChoiceField(choices=BULK_ACTIONS)
+    items = serializers.ListField(child=RolePermissionPairSerializer(), allow_empty=False)
+
+    def validate_items(self, value):
+        if len(value) > settings.RBAC_BULK_MAX_ITEMS:
+            raise serializers.ValidationError(f"Не больше {settings.RBAC_BULK_MAX_ITEMS} элементов за запрос")
+
+        role_ids = {item["role_id"] for item in value}
+        permission_ids = {item["permission_id"] for item in value}
+        _missing_ids_error("Роли", role_ids, Role.objects.filter(id__in=role_ids).values_list("id", flat=True))
+
+        # The codes scope the effective-permission sync later, so they are read here in the same query.
+        self.permission_codes = dict(Permission.objects.filter(id__in=permission_ids).values_list("id", "code"))
+        _missing_ids_error("Права", permission_ids, self.permission_codes)
+
+        return list(dict.fromkeys((item["role_id"], item["permission_id"]) for item in value))
+
+    def validate(self, attrs):
+        attrs["permission_codes"] = self.permission_codes
+        return attrs
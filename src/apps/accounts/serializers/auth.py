@@ -49,7 +49,10 @@ class RefreshTokenSerializer(serializers.Serializer):
     refresh_token = serializers.CharField(required=True)
 
     def create(self, validated_data):
-        access_token = refresh_access_token(validated_data["refresh_token"])
+        request = self.context.get("request")
+        access_token = refresh_access_token(
+            validated_data["refresh_token"], getattr(request, "parsed_refresh_token", None)
+        )
         return {"access_token": access_token}
 
 
@@ -61,7 +64,7 @@ class LogoutSerializer(serializers.Serializer):
         if not request or not request.user.is_authenticated:
             raise serializers.ValidationError("Пользователь не аутентифицирован")
 
-        access_token = str(request.auth) if request.auth else None
+        access_token = request.auth
         if not access_token:
             raise serializers.ValidationError("Access токен не найден")
 
@@ -1,11 +1,20 @@
-from django.contrib.auth import authenticate
+from django.contrib.auth.signals import user_login_failed
 from django.db import transaction
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.tokens import RefreshToken, Token
 from rest_framework_simplejwt.exceptions import TokenError
 
 from apps.accounts.models.rbac import Role
 from apps.accounts.models.user import User
-from apps.accounts.utils.jwt_utils import add_token_to_blacklist, generate_tokens, is_token_blacklisted
+from apps.accounts.utils.jwt_utils import (
+    ParsedToken,
+    ais_jti_blacklisted,
+    blacklist_parsed_token,
+    generate_tokens,
+    is_jti_blacklisted,
+    parse_token,
+    parse_validated_token,
+)
+from apps.accounts.utils.password_hashing import password_hashing_pool
 from apps.common.exceptions import BusinessLogicException, ValidationException
 
 
@@ -23,10 +32,13 @@ def register_user(email: str,password: str,password_confirm: str,first_name: str
             errors=[{"code": "email_exists", "detail": "Пользователь с таким email уже существует", "attr": "email"}],
         )
 
+    # Hashed before the transaction opens, so no row locks are held while waiting for the hashing pool.
+    encoded_password = password_hashing_pool.hash_password(password)
+
     with transaction.atomic():
         user = User.objects.create_user(
             email=email,
-            password=password,
+            encoded_password=encoded_password,
             first_name=first_name,
             last_name=last_name,
             middle_name=middle_name,
@@ -42,9 +54,7 @@ def register_user(email: str,password: str,password_confirm: str,first_name: str
     return user, tokens
 
 
-def authenticate_user(email: str, password: str) -> tuple[User, dict[str, str]]:
-    user = authenticate(username=email, password=password)
-
+def _ensure_can_login(user: User | None) -> None:
     if not user:
         raise ValidationException(
             message="Неверный email или пароль",
@@ -58,14 +68,77 @@ def authenticate_user(email: str, password: str) -> tuple[User, dict[str, str]]:
             errors=[{"code": "account_inactive", "detail": f"Аккаунт {reason}"}],
         )
 
+
+def _check_credentials(email: str, password: str) -> User | None:
+    """ModelBackend.authenticate with password hashing in the hashing pool instead of the request thread."""
+    try:
+        user = User.objects.get_by_natural_key(email)
+    except User.DoesNotExist:
+        # Hash anyway, as ModelBackend does, so response time doesn't reveal whether the email exists.
+        password_hashing_pool.hash_password(password)
+        return None
+
+    is_correct, must_update = password_hashing_pool.verify_password(password, user.password)
+    if not is_correct or not user.is_active:
+        return None
+
+    if must_update:
+        user.password = password_hashing_pool.hash_password(password)
+        user.save(update_fields=["password"])
+    return user
+
+
+async def _acheck_credentials(email: str, password: str) -> User | None:
+    """See _check_credentials(); the event loop keeps serving other requests while the pool hashes."""
+    try:
+        user = await User.objects.aget_by_natural_key(email)
+    except User.DoesNotExist:
+        await password_hashing_pool.ahash_password(password)
+        return None
+
+    is_correct, must_update = await password_hashing_pool.averify_password(password, user.password)
+    if not is_correct or not user.is_active:
+        return None
+
+    if must_update:
+        user.password = await password_hashing_pool.ahash_password(password)
+        await user.asave(update_fields=["password"])
+    return user
+
+
+def authenticate_user(email: str, password: str) -> tuple[User, dict[str, str]]:
+    user = _check_credentials(email, password)
+    if user is None:
+        # Sent by django.contrib.auth.authenticate(), which _check_credentials replaces.
+        user_login_failed.send(sender=__name__, credentials={"username": email}, request=None)
+    _ensure_can_login(user)
+
     tokens = generate_tokens(user)
 
     return user, tokens
 
 
-def logout_user(access_token: str, refresh_token: str, user: User) -> None:
-    access_blacklisted = add_token_to_blacklist(access_token, user)
-    refresh_blacklisted = add_token_to_blacklist(refresh_token, user)
+async def aauthenticate_user(email: str, password: str) -> tuple[User, dict[str, str]]:
+    user = await _acheck_credentials(email, password)
+    if user is None:
+        await user_login_failed.asend(sender=__name__, credentials={"username": email}, request=None)
+    _ensure_can_login(user)
+
+    tokens = generate_tokens(user)
+
+    return user, tokens
+
+
+def logout_user(access_token: Token | str, refresh_token: str, user: User) -> None:
+    # The access token was already verified by authentication, so only the refresh token is decoded here.
+    if isinstance(access_token, Token):
+        parsed_access = parse_validated_token(access_token)
+    else:
+        parsed_access = parse_token(access_token)
+    parsed_refresh = parse_token(refresh_token, RefreshToken)
+
+    access_blacklisted = blacklist_parsed_token(parsed_access, user) if parsed_access else None
+    refresh_blacklisted = blacklist_parsed_token(parsed_refresh, user) if parsed_refresh else None
 
     if not access_blacklisted or not refresh_blacklisted:
         raise ValidationException(
@@ -74,37 +147,63 @@ def logout_user(access_token: str, refresh_token: str, user: User) -> None:
         )
 
 
-def refresh_access_token(refresh_token: str) -> dict[str, str]:
-    try:
-        refresh = RefreshToken(refresh_token)
-    except TokenError:
+def _validate_refresh_token(refresh_token: str, parsed: ParsedToken | None = None) -> RefreshToken:
+    # parsed is the same token already verified by RefreshUserThrottle, if that throttle ran.
+    if parsed is not None and isinstance(parsed.token, RefreshToken) and parsed.token.token == refresh_token:
+        refresh = parsed.token
+    else:
+        try:
+            refresh = RefreshToken(refresh_token)
+        except TokenError as exc:
+            raise ValidationException(
+                message="Невалидный refresh токен",
+                errors=[{"code": "invalid_refresh_token", "detail": "Невалидный refresh токен"}],
+            ) from exc
+
+    if not refresh.payload.get("user_id"):
         raise ValidationException(
             message="Невалидный refresh токен",
             errors=[{"code": "invalid_refresh_token", "detail": "Невалидный refresh токен"}],
         )
 
-    if is_token_blacklisted(refresh_token):
-        raise ValidationException(
-            message="Refresh токен в blacklist",
-            errors=[{"code": "token_blacklisted", "detail": "Refresh токен в blacklist"}],
-        )
+    return refresh
 
-    user_id = refresh.payload.get("user_id")
-    if not user_id:
-        raise ValidationException(
-            message="Невалидный refresh токен",
-            errors=[{"code": "invalid_refresh_token", "detail": "Невалидный refresh токен"}],
-        )
 
-    try:
-        user = User.objects.get(id=user_id, is_active=True, deleted_at__isnull=True)
-    except User.DoesNotExist:
-        raise ValidationException(
-            message="Пользователь не найден или неактивен",
-            errors=[{"code": "user_not_found", "detail": "Пользователь не найден или неактивен"}],
-        )
+def _refresh_blacklisted_error() -> ValidationException:
+    return ValidationException(
+        message="Refresh токен в blacklist",
+        errors=[{"code": "token_blacklisted", "detail": "Refresh токен в blacklist"}],
+    )
+
+
+def _refresh_user_not_found_error() -> ValidationException:
+    return ValidationException(
+        message="Пользователь не найден или неактивен",
+        errors=[{"code": "user_not_found", "detail": "Пользователь не найден или неактивен"}],
+    )
+
+
+def refresh_access_token(refresh_token: str, parsed: ParsedToken | None = None) -> str:
+    refresh = _validate_refresh_token(refresh_token, parsed)
+
+    if is_jti_blacklisted(parse_validated_token(refresh).jti):
+        raise _refresh_blacklisted_error()
+
+    active_users = User.objects.filter(id=refresh.payload["user_id"], is_active=True, deleted_at__isnull=True)
+    if not active_users.exists():
+        raise _refresh_user_not_found_error()
+
+    return str(refresh.access_token)
+
+
+async def arefresh_access_token(refresh_token: str, parsed: ParsedToken | None = None) -> str:
+    refresh = _validate_refresh_token(refresh_token, parsed)
 
-    access_token = refresh.access_token
+    if await ais_jti_blacklisted(parse_validated_token(refresh).jti):
+        raise _refresh_blacklisted_error()
 
-    return str(access_token)
+    active_users = User.objects.filter(id=refresh.payload["user_id"], is_active=True, deleted_at__isnull=True)
+    if not await active_users.aexists():
+        raise _refresh_user_not_found_error()
 
+    return str(refresh.access_token)
@@ -0,0 +1,246 @@
+import logging
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.color import no_style
+from django.db import connection, connections, transaction
+from django.utils import timezone
+
+from apps.accounts.models.auth import TokenBlacklist
+
+logger = logging.getLogger(__name__)
+
+TABLE = TokenBlacklist._meta.db_table
+PARTITION_NAME = TABLE + "_p{day:%Y%m%d}"
+DEFAULT_PARTITION = TABLE + "_default"
+LEGACY_TABLE = TABLE + "_legacy"
+SWEEPER_LOCK_KEY = "auth:blacklist:sweeper:lock"
+
+
+def is_partitioned() -> bool:
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass(%s)", [TABLE])
+        row = cursor.fetchone()
+    return bool(row and row[0])
+
+
+def delete_expired_rows(batch_size: int | None = None) -> int:
+    """Delete expired rows in batches of batch_size, each in its own short transaction."""
+    batch_size = batch_size or settings.TOKEN_BLACKLIST_CLEANUP_BATCH_SIZE
+    expired = TokenBlacklist.objects.filter(expires_at__lt=timezone.now())
+
+    deleted = 0
+    while True:
+        batch_ids = list(expired.values_list("id", flat=True)[:batch_size])
+        if not batch_ids:
+            return deleted
+        deleted += TokenBlacklist.objects.filter(id__in=batch_ids).delete()[0]
+
+
+def _partition_bounds(cursor) -> list[tuple[str, datetime | None]]:
+    """(partition name, upper bound of its range) for every partition; the default partition has no bound."""
+    cursor.execute(
+        """
+        SELECT child.relname, pg_get_expr(child.relpartbound, child.oid)
+        FROM pg_inherits
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE pg_inherits.inhparent = to_regclass(%s)
+        """,
+        [TABLE],
+    )
+    bounds = []
+    for name, bound in cursor.fetchall():
+        if bound == "DEFAULT":
+            bounds.append((name, None))
+        else:
+            # FOR VALUES FROM ('...') TO ('...')
+            upper = bound.rsplit("'", 2)[-2]
+            bounds.append((name, datetime.fromisoformat(upper)))
+    return bounds
+
+
+def create_partitions(days_ahead: int | None = None, start: date | None = None) -> int:
+    """Create daily partitions from start (today by default) through days_ahead days from today."""
+    days_ahead = settings.TOKEN_BLACKLIST_PARTITIONS_AHEAD if days_ahead is None else days_ahead
+    today = timezone.now().date()
+    day = min(start or today, today)
+
+    created = 0
+    with connection.cursor() as cursor:
+        existing = {name for name, _ in _partition_bounds(cursor)}
+        while day <= today + timedelta(days=days_ahead):
+            if PARTITION_NAME.format(day=day) not in existing:
+                _create_partition(cursor, day)
+                created += 1
+            day += timedelta(days=1)
+    return created
+
+
+def _create_partition(cursor, day: date) -> None:
+    name = PARTITION_NAME.format(day=day)
+    bounds = [day.isoformat(), (day + timedelta(days=1)).isoformat()]
+    in_default = f'FROM "{DEFAULT_PARTITION}" WHERE expires_at >= %s AND expires_at < %s'
+
+    # PostgreSQL refuses to attach a range that already has rows in the default partition,
+    # so such rows are moved out and back in around the CREATE.
+    with transaction.atomic():
+        cursor.execute(f'CREATE TEMP TABLE "{name}_moved" ON COMMIT DROP AS SELECT * {in_default}', bounds)
+        cursor.execute(f"DELETE {in_default}", bounds)
+        cursor.execute(f'CREATE TABLE "{name}" PARTITION OF "{TABLE}" FOR VALUES FROM (%s) TO (%s)', bounds)
+        cursor.execute(f'INSERT INTO "{TABLE}" SELECT * FROM "{name}_moved"')
+
+
+def drop_expired_partitions() -> int:
+    """Drop whole daily partitions whose range ended before now: O(1) instead of deleting row by row."""
+    now = timezone.now()
+    dropped = 0
+    with connection.cursor() as cursor:
+        for name, upper in _partition_bounds(cursor):
+            if upper is not None and upper <= now:
+                cursor.execute(f'DROP TABLE "{name}"')
+                dropped += 1
+    return dropped
+
+
+def partition_token_blacklist() -> int:
+    """
+    Convert token_blacklist into a table partitioned by expires_at (PostgreSQL only).
+
+    Opt-in and kept out of migrations: the result differs from the model in its primary key, which becomes
+    (id, expires_at) because every unique constraint of a partitioned table must include the partition key.
+    Constraint and index names are taken from the model, so migrations still find them. Expired rows are not
+    copied. Returns the number of rows moved; unpartition_token_blacklist() restores the model's layout.
+    """
+    sequence = TABLE + "_partitioned_id_seq"
+    user_table = TokenBlacklist._meta.get_field("user").related_model._meta.db_table
+
+    with transaction.atomic(), connection.schema_editor() as editor, connection.cursor() as cursor:
+        cursor.execute(f'LOCK TABLE "{TABLE}" IN ACCESS EXCLUSIVE MODE')
+        cursor.execute(f'ALTER TABLE "{TABLE}" RENAME TO "{LEGACY_TABLE}"')
+        cursor.execute(f'CREATE SEQUENCE "{sequence}"')
+        cursor.execute(f'SELECT setval(%s, COALESCE((SELECT max(id) FROM "{LEGACY_TABLE}"), 0) + 1, false)', [sequence])
+        # The primary key, constraint and indexes are added once the legacy table has released their names.
+        cursor.execute(
+            f"""
+            CREATE TABLE "{TABLE}" (
+                id bigint NOT NULL DEFAULT nextval('{sequence}'),
+                created_at timestamp with time zone NOT NULL,
+                updated_at timestamp with time zone NOT NULL,
+                token_jti varchar(255) NOT NULL,
+                expires_at timestamp with time zone NOT NULL,
+                blacklisted_at timestamp with time zone NOT NULL,
+                user_id bigint NOT NULL REFERENCES "{user_table}" (id) DEFERRABLE INITIALLY DEFERRED
+            ) PARTITION BY RANGE (expires_at)
+            """
+        )
+        cursor.execute(f'ALTER SEQUENCE "{sequence}" OWNED BY "{TABLE}".id')
+        # Safety net for rows outside the daily partitions (e.g. tokens with an unusually long lifetime).
+        cursor.execute(f'CREATE TABLE "{DEFAULT_PARTITION}" PARTITION OF "{TABLE}" DEFAULT')
+
+        cursor.execute(f'SELECT min(expires_at) FROM "{LEGACY_TABLE}" WHERE expires_at >= now()')
+        oldest = cursor.fetchone()[0]
+        create_partitions(start=oldest.date() if oldest else None)
+
+        cursor.execute(
+            f"""
+            INSERT INTO "{TABLE}" (id, created_at, updated_at, token_jti, expires_at, blacklisted_at, user_id)
+            SELECT id, created_at, updated_at, token_jti, expires_at, blacklisted_at, user_id
+            FROM "{LEGACY_TABLE}" WHERE expires_at >= now()
+            """
+        )
+        moved = cursor.rowcount
+        cursor.execute(f'DROP TABLE "{LEGACY_TABLE}"')
+
+        cursor.execute(f'ALTER TABLE "{TABLE}" ADD PRIMARY KEY (id, expires_at)')
+        for constraint in TokenBlacklist._meta.constraints:
+            editor.add_constraint(TokenBlacklist, constraint)
+        for index in TokenBlacklist._meta.indexes:
+            editor.add_index(TokenBlacklist, index)
+    return moved
+
+
+def unpartition_token_blacklist() -> int:
+    """
+    Turn a partitioned token_blacklist back into the plain table the migrations describe (PostgreSQL only).
+
+    Run it before a migration that alters the table, then partition again. Returns the number of rows moved.
+    """
+    with transaction.atomic(), connection.schema_editor() as editor, connection.cursor() as cursor:
+        cursor.execute(f'LOCK TABLE "{TABLE}" IN ACCESS EXCLUSIVE MODE')
+        cursor.execute(f'ALTER TABLE "{TABLE}" RENAME TO "{LEGACY_TABLE}"')
+        # Constraint and index names are schema-wide, so the legacy table gives them up before create_model.
+        cursor.execute(f'ALTER TABLE "{LEGACY_TABLE}" DROP CONSTRAINT "{TABLE}_pkey"')
+        for constraint in TokenBlacklist._meta.constraints:
+            cursor.execute(f'ALTER TABLE "{LEGACY_TABLE}" DROP CONSTRAINT "{constraint.name}"')
+        for index in TokenBlacklist._meta.indexes:
+            cursor.execute(f'DROP INDEX "{index.name}"')
+
+        editor.create_model(TokenBlacklist)
+        cursor.execute(
+            f"""
+            INSERT INTO "{TABLE}" (id, created_at, updated_at, token_jti, expires_at, blacklisted_at, user_id)
+            SELECT id, created_at, updated_at, token_jti, expires_at, blacklisted_at, user_id
+            FROM "{LEGACY_TABLE}"
+            """
+        )
+        moved = cursor.rowcount
+        for sql in connection.ops.sequence_reset_sql(no_style(), [TokenBlacklist]):
+            cursor.execute(sql)
+        cursor.execute(f'DROP TABLE "{LEGACY_TABLE}"')
+    return moved
+
+
+def cleanup_token_blacklist(batch_size: int | None = None) -> dict[str, int]:
+    """One sweep: on a partitioned table drop past partitions and pre-create upcoming ones, then delete leftovers."""
+    result = {"partitions_dropped": 0, "partitions_created": 0, "rows_deleted": 0}
+    if is_partitioned():
+        result["partitions_dropped"] = drop_expired_partitions()
+        result["partitions_created"] = create_partitions()
+    # Rows in the default partition and the current day's partition still expire one by one.
+    result["rows_deleted"] = delete_expired_rows(batch_size)
+    return result
+
+
+class BlacklistSweeper:
+    """
+    In-process periodic cleanup, enabled by TOKEN_BLACKLIST_CLEANUP_INTERVAL > 0.
+
+    Every worker process runs the thread, but a cache lock held for one interval lets a single process
+    sweep per interval (across replicas too when the cache is shared).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def start(self, **kwargs) -> None:
+        interval = settings.TOKEN_BLACKLIST_CLEANUP_INTERVAL
+        if interval <= 0 or self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+        threading.Thread(target=self._run, args=(interval,), name="blacklist-sweeper", daemon=True).start()
+
+    def _run(self, interval: int) -> None:
+        while True:
+            time.sleep(interval)
+            if not cache.add(SWEEPER_LOCK_KEY, os.getpid(), timeout=interval):
+                continue
+            try:
+                result = cleanup_token_blacklist()
+                logger.info("Token blacklist sweep finished", extra=result)
+            except Exception:
+                logger.exception("Token blacklist sweep failed")
+            finally:
+                connections.close_all()
+
+
+blacklist_sweeper = BlacklistSweeper()
@@ -0,0 +1,216 @@
+from collections import defaultdict
+from collections.abc import Iterable
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Q, QuerySet
+
+from apps.accounts.models.rbac import RolePermission, UserEffectivePermission, UserRole
+from apps.accounts.utils.permission_grants import PermissionGrants
+from apps.accounts.utils.user_snapshot import invalidate_user_snapshot
+from apps.common.cache import aget_or_set, aget_versions, bump_versions, get_or_set, get_versions
+
+User = get_user_model()
+
+PERMISSIONS_VERSION_KEY = "rbac:permissions:version"
+USER_PERMISSIONS_VERSION_KEY = "rbac:permissions:user:{user_id}:version"
+USER_PERMISSIONS_KEY = "rbac:permissions:user:{user_id}:{version}:{user_version}"
+
+
+def load_user_permission_codes(user_id: int) -> PermissionGrants:
+    return PermissionGrants(
+        UserEffectivePermission.objects.filter(user_id=user_id).values_list("permission_code", flat=True)
+    )
+
+
+def get_user_permission_codes(user_id: int) -> PermissionGrants:
+    version, user_version = get_versions(PERMISSIONS_VERSION_KEY, USER_PERMISSIONS_VERSION_KEY.format(user_id=user_id))
+    key = USER_PERMISSIONS_KEY.format(user_id=user_id, version=version, user_version=user_version)
+    return get_or_set(
+        key, lambda: load_user_permission_codes(user_id), settings.PERMISSION_CACHE_TIMEOUT, name="permissions"
+    )
+
+
+async def aload_user_permission_codes(user_id: int) -> PermissionGrants:
+    codes = UserEffectivePermission.objects.filter(user_id=user_id).values_list("permission_code", flat=True)
+    return PermissionGrants([code async for code in codes])
+
+
+async def aget_user_permission_codes(user_id: int) -> PermissionGrants:
+    version, user_version = await aget_versions(
+        PERMISSIONS_VERSION_KEY, USER_PERMISSIONS_VERSION_KEY.format(user_id=user_id)
+    )
+    key = USER_PERMISSIONS_KEY.format(user_id=user_id, version=version, user_version=user_version)
+    return await aget_or_set(
+        key, lambda: aload_user_permission_codes(user_id), settings.PERMISSION_CACHE_TIMEOUT, name="permissions"
+    )
+
+
+def invalidate_user_permissions(*user_ids: int) -> None:
+    bump_versions(*[USER_PERMISSIONS_VERSION_KEY.format(user_id=user_id) for user_id in user_ids])
+
+
+def invalidate_all_permissions() -> None:
+    bump_versions(PERMISSIONS_VERSION_KEY)
+
+
+def sync_effective_permissions(
+    user_ids: Iterable[int] | QuerySet | None = None,
+    permission_codes: Iterable[str] | None = None,
+) -> None:
+    """
+    Reconcile user_effective_permissions with user_roles x role_permissions.
+
+    Only rows inside the scope are touched: the given users and/or permission codes, None meaning unrestricted.
+    A values_list queryset of user ids is used as a subquery, so a role held by many users isn't expanded
+    into one huge IN list. The affected users are locked first, so concurrent syncs of one user serialize.
+    """
+    if user_ids is not None and not isinstance(user_ids, QuerySet):
+        user_ids = list(user_ids)
+    if permission_codes is not None:
+        permission_codes = list(permission_codes)
+
+    with transaction.atomic():
+        _lock_users(user_ids, permission_codes)
+        _sync_effective_permissions(user_ids, permission_codes)
+
+
+def _lock_users(user_ids, permission_codes) -> None:
+    # Two syncs of one user diff against the same rows: without the lock, one can delete a row the other's
+    # role change still needs. The lock makes the second wait and diff against the first one's result.
+    users = User.objects.all()
+    if user_ids is not None:
+        users = users.filter(pk__in=user_ids)
+    if permission_codes is not None:
+        # Subqueries rather than joins, so FOR UPDATE locks user rows only and needs no DISTINCT.
+        holders = UserEffectivePermission.objects.filter(permission_code__in=permission_codes).values("user_id")
+        grantees = UserRole.objects.filter(role__role_permissions__permission__code__in=permission_codes)
+        users = users.filter(Q(pk__in=holders) | Q(pk__in=grantees.values("user_id")))
+    list(users.select_for_update().order_by("pk").values_list("pk", flat=True))
+
+
+def _sync_effective_permissions(user_ids, permission_codes) -> None:
+    # A single filter() call keeps every condition on the same user_roles join.
+    granted_filters = {"role__user_roles__isnull": False}
+    current_filters = {}
+    if user_ids is not None:
+        granted_filters["role__user_roles__user_id__in"] = user_ids
+        current_filters["user_id__in"] = user_ids
+    if permission_codes is not None:
+        granted_filters["permission__code__in"] = permission_codes
+        current_filters["permission_code__in"] = permission_codes
+
+    desired_rows = set(
+        RolePermission.objects.filter(**granted_filters)
+        .values_list("role__user_roles__user_id", "permission__code")
+        .distinct()
+    )
+    current_rows = set(
+        UserEffectivePermission.objects.filter(**current_filters).values_list("user_id", "permission_code")
+    )
+
+    UserEffectivePermission.objects.bulk_create(
+        [
+            UserEffectivePermission(user_id=user_id, permission_code=permission_code)
+            for user_id, permission_code in desired_rows - current_rows
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+    stale_user_ids = defaultdict(list)
+    for user_id, permission_code in current_rows - desired_rows:
+        stale_user_ids[permission_code].append(user_id)
+    for permission_code, stale_ids in stale_user_ids.items():
+        UserEffectivePermission.objects.filter(permission_code=permission_code, user_id__in=stale_ids).delete()
+
+
+def on_user_roles_changed(*user_ids: int) -> None:
+    sync_effective_permissions(user_ids=user_ids)
+    invalidate_user_permissions(*user_ids)
+    invalidate_user_snapshot(*user_ids)
+
+
+def on_role_permissions_changed(
+    role_ids: Iterable[int] | None = None,
+    permission_codes: Iterable[str] | None = None,
+) -> None:
+    user_ids = None
+    if role_ids is not None:
+        user_ids = UserRole.objects.filter(role_id__in=list(role_ids)).values_list("user_id", flat=True).distinct()
+    sync_effective_permissions(user_ids=user_ids, permission_codes=permission_codes)
+    invalidate_all_permissions()
+
+
+def _group_pairs(pairs: Iterable[tuple[int, int]]) -> dict[int, list[int]]:
+    grouped = defaultdict(list)
+    for key, value in pairs:
+        grouped[key].append(value)
+    return grouped
+
+
+def bulk_assign_user_roles(pairs: list[tuple[int, int]], assigned_by=None) -> int:
+    """Assign (user_id, role_id) pairs in one insert; pairs that already exist are skipped."""
+    user_ids = {user_id for user_id, _ in pairs}
+    existing = set(
+        UserRole.objects.filter(user_id__in=user_ids, role_id__in={role_id for _, role_id in pairs}).values_list(
+            "user_id", "role_id"
+        )
+    )
+    new_pairs = [pair for pair in pairs if pair not in existing]
+
+    UserRole.objects.bulk_create(
+        [UserRole(user_id=user_id, role_id=role_id, assigned_by=assigned_by) for user_id, role_id in new_pairs],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+    if new_pairs:
+        on_user_roles_changed(*{user_id for user_id, _ in new_pairs})
+    return len(new_pairs)
+
+
+def bulk_remove_user_roles(pairs: list[tuple[int, int]]) -> int:
+    deleted = 0
+    for role_id, user_ids in _group_pairs((role_id, user_id) for user_id, role_id in pairs).items():
+        deleted += UserRole.objects.filter(role_id=role_id, user_id__in=user_ids).delete()[0]
+
+    if deleted:
+        on_user_roles_changed(*{user_id for user_id, _ in pairs})
+    return deleted
+
+
+def bulk_assign_role_permissions(pairs: list[tuple[int, int]], permission_codes: dict[int, str]) -> int:
+    """Assign (role_id, permission_id) pairs in one insert; pairs that already exist are skipped."""
+    existing = set(
+        RolePermission.objects.filter(
+            role_id__in={role_id for role_id, _ in pairs},
+            permission_id__in={permission_id for _, permission_id in pairs},
+        ).values_list("role_id", "permission_id")
+    )
+    new_pairs = [pair for pair in pairs if pair not in existing]
+
+    RolePermission.objects.bulk_create(
+        [RolePermission(role_id=role_id, permission_id=permission_id) for role_id, permission_id in new_pairs],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+    if new_pairs:
+        on_role_permissions_changed(
+            role_ids={role_id for role_id, _ in new_pairs},
+            permission_codes={permission_codes[permission_id] for _, permission_id in new_pairs},
+        )
+    return len(new_pairs)
+
+
+def bulk_remove_role_permissions(pairs: list[tuple[int, int]], permission_codes: dict[int, str]) -> int:
+    deleted = 0
+    for role_id, permission_ids in _group_pairs(pairs).items():
+        deleted += RolePermission.objects.filter(role_id=role_id, permission_id__in=permission_ids).delete()[0]
+
+    if deleted:
+        on_role_permissions_changed(
+            role_ids={role_id for role_id, _ in pairs},
+            permission_codes={permission_codes[permission_id] for _, permission_id in pairs},
+        )
+    return deleted
@@ -1,5 +1,8 @@
 from apps.accounts.models.user import User
+from apps.accounts.utils.user_snapshot import invalidate_user_snapshot
+from apps.blog.services import POSTS_RESPONSE_CACHE_NAMESPACE
 from apps.common.exceptions import BusinessLogicException, ValidationException
+from apps.common.response_cache import invalidate_response_cache
 
 
 def update_user_profile(user: User,first_name: str | None = None,last_name: str | None = None,middle_name: str | None = None,email: str | None = None,) -> User:
@@ -34,6 +37,10 @@ def update_user_profile(user: User,first_name: str | None = None,last_name: str
     if has_changes:
         update_fields.append("updated_at")
         user.save(update_fields=update_fields)
+        invalidate_user_snapshot(user.id)
+        if "email" in update_fields:
+            # Post lists render the author's email.
+            invalidate_response_cache(POSTS_RESPONSE_CACHE_NAMESPACE)
 
     return user
 
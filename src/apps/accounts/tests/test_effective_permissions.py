@@ -0,0 +1,83 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from apps.accounts.models.rbac import Permission, PermissionAction, Role, UserEffectivePermission
+from apps.accounts.services.rbac_service import (
+    bulk_assign_user_roles,
+    bulk_remove_role_permissions,
+    bulk_remove_user_roles,
+)
+
+User = get_user_model()
+
+
+class EffectivePermissionSyncTests(TestCase):
+    """
+    The user_effective_permissions rows follow role and role permission changes.
+
+    Both roles grant "sync.shared.read", so removing it through one of them must keep the row.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.permissions = {
+            code: Permission.objects.create(
+                code=code, name=code, resource_type=code.rsplit(".", 1)[0], action=PermissionAction.READ
+            )
+            for code in ["sync.editor.read", "sync.viewer.read", "sync.shared.read"]
+        }
+        cls.editor = Role.objects.create(name="sync-editor")
+        cls.viewer = Role.objects.create(name="sync-viewer")
+        for role, prefix in [(cls.editor, "sync.editor"), (cls.viewer, "sync.viewer")]:
+            role.add_permission(cls.permissions[f"{prefix}.read"])
+            role.add_permission(cls.permissions["sync.shared.read"])
+
+        cls.user = User.objects.create_user(email="sync-user@test.com", password=None)
+        cls.other = User.objects.create_user(email="sync-other@test.com", password=None)
+
+    def effective_codes(self, user):
+        return set(UserEffectivePermission.objects.filter(user=user).values_list("permission_code", flat=True))
+
+    def test_role_added(self):
+        self.user.add_role(self.editor)
+
+        self.assertEqual(self.effective_codes(self.user), {"sync.editor.read", "sync.shared.read"})
+        self.assertEqual(self.effective_codes(self.other), set())
+
+    def test_role_removed_keeps_codes_granted_by_another_role(self):
+        self.user.add_role(self.editor)
+        self.user.add_role(self.viewer)
+        self.assertEqual(self.effective_codes(self.user), {"sync.editor.read", "sync.viewer.read", "sync.shared.read"})
+
+        self.user.remove_role(self.editor)
+
+        self.assertEqual(self.effective_codes(self.user), {"sync.viewer.read", "sync.shared.read"})
+
+    def test_bulk_role_assignment_and_removal(self):
+        bulk_assign_user_roles([(self.user.id, self.editor.id), (self.other.id, self.viewer.id)])
+
+        self.assertEqual(self.effective_codes(self.user), {"sync.editor.read", "sync.shared.read"})
+        self.assertEqual(self.effective_codes(self.other), {"sync.viewer.read", "sync.shared.read"})
+
+        bulk_remove_user_roles([(self.user.id, self.editor.id), (self.other.id, self.viewer.id)])
+
+        self.assertEqual(self.effective_codes(self.user), set())
+        self.assertEqual(self.effective_codes(self.other), set())
+
+    def test_role_permission_deleted(self):
+        self.user.add_role(self.editor)
+        self.other.add_role(self.editor)
+        self.other.add_role(self.viewer)
+
+        self.editor.remove_permission(self.permissions["sync.shared.read"])
+
+        self.assertEqual(self.effective_codes(self.user), {"sync.editor.read"})
+        self.assertEqual(self.effective_codes(self.other), {"sync.editor.read", "sync.viewer.read", "sync.shared.read"})
+
+    def test_bulk_role_permission_deleted(self):
+        self.user.add_role(self.editor)
+        permission = self.permissions["sync.editor.read"]
+
+        bulk_remove_role_permissions([(self.editor.id, permission.id)], {permission.id: permission.code})
+
+        self.assertEqual(self.effective_codes(self.user), {"sync.shared.read"})
@@ -0,0 +1,81 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+
+from apps.accounts.models.rbac import Permission, PermissionAction, Role
+from apps.accounts.utils.permission_grants import PermissionGrants
+from apps.accounts.utils.permission_registry import permission_registry
+from apps.common.permissions import acheck_permissions, check_permissions
+
+User = get_user_model()
+
+
+class PermissionGrantsTests(SimpleTestCase):
+    def test_wildcard_covers_codes_under_its_prefix_only(self):
+        grants = PermissionGrants(["blog.*"])
+
+        self.assertIn("blog.read", grants)
+        self.assertIn("blog.post.create", grants)
+        self.assertNotIn("blog", grants)
+        self.assertNotIn("blogs.read", grants)
+        self.assertNotIn("accounts.user.read", grants)
+
+    def test_nested_wildcard(self):
+        grants = PermissionGrants(["blog.post.*"])
+
+        self.assertIn("blog.post.read", grants)
+        self.assertNotIn("blog.post", grants)
+        self.assertNotIn("blog.comment.read", grants)
+
+    def test_global_wildcard_grants_everything(self):
+        grants = PermissionGrants(["*"])
+
+        for code in ["blog", "blog.read", "blog.post.create", "accounts.user.delete"]:
+            with self.subTest(code=code):
+                self.assertIn(code, grants)
+
+    def test_exact_codes(self):
+        grants = PermissionGrants(["blog.post.read"])
+
+        self.assertIn("blog.post.read", grants)
+        self.assertNotIn("blog.post.update", grants)
+        self.assertEqual(set(grants), {"blog.post.read"})
+        self.assertEqual(len(grants), 1)
+
+
+class CheckPermissionsTests(TestCase):
+    """A wildcard grant answers for registered codes only: codes missing from the permissions table are denied."""
+
+    @classmethod
+    def setUpTestData(cls):
+        role = Role.objects.create(name="check-permissions-blog-admin")
+        role.add_permission(
+            Permission.objects.create(code="blog.*", name="Blog", resource_type="blog", action=PermissionAction.ALL)
+        )
+        Permission.objects.create(
+            code="blog.post.read", name="Read posts", resource_type="blog.post", action=PermissionAction.READ
+        )
+        cls.user = User.objects.create_user(email="check-permissions@test.com", password=None)
+        cls.user.add_role(role)
+
+    def setUp(self):
+        # Rolled-back test transactions never run the on_commit invalidations, so earlier state is dropped here.
+        cache.clear()
+        permission_registry.reset()
+
+    def test_check_permissions_denies_unregistered_codes(self):
+        self.assertEqual(
+            check_permissions(self.user, ["blog.post.read", "blog.nonexistent.zzz", "accounts.user.read"]),
+            {"blog.post.read": True, "blog.nonexistent.zzz": False, "accounts.user.read": False},
+        )
+
+    async def test_acheck_permissions_denies_unregistered_codes(self):
+        self.assertEqual(
+            await acheck_permissions(self.user, ["blog.post.read", "blog.nonexistent.zzz", "accounts.user.read"]),
+            {"blog.post.read": True, "blog.nonexistent.zzz": False, "accounts.user.read": False},
+        )
+
+    def test_inactive_user_is_denied(self):
+        self.user.is_active = False
+
+        self.assertEqual(check_permissions(self.user, ["blog.post.read"]), {"blog.post.read": False})
@@ -0,0 +1,79 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import resolve, reverse
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.accounts.models.rbac import Permission, PermissionAction, Role, RolePermission, UserRole
+
+User = get_user_model()
+
+ROWS = 50
+
+ADMIN_LIST_ENDPOINTS = [
+    ("accounts:admin-role-list", {}),
+    ("accounts:admin-permission-list", {}),
+    ("accounts:admin-user-list", {}),
+    ("accounts:admin-role-permission-list", {"role_id": "role"}),
+    ("accounts:admin-user-role-list", {"user_id": "user"}),
+]
+
+
+class AdminQueryBudgetTests(TestCase):
+    """
+    GET requests to the admin list endpoints stay within the view's query_budget.
+
+    Authentication is forced, so only the view's own queries are counted (see QUERY_BUDGET_OVERHEAD).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        admin_role, _ = Role.objects.get_or_create(name="admin")
+        cls.admin = User.objects.create_user(email="query-budget-admin@test.com", password=None)
+        UserRole.objects.create(user=cls.admin, role=admin_role)
+
+        roles = Role.objects.bulk_create([Role(name=f"query-budget-role-{i}") for i in range(ROWS)])
+        permissions = Permission.objects.bulk_create(
+            [
+                Permission(
+                    code=f"query_budget.resource.{i}",
+                    name=f"Query budget {i}",
+                    resource_type="query_budget.resource",
+                    action=PermissionAction.READ,
+                )
+                for i in range(ROWS)
+            ]
+        )
+        users = User.objects.bulk_create([User(email=f"query-budget-{i}@test.com") for i in range(ROWS)])
+
+        RolePermission.objects.bulk_create(
+            [RolePermission(role=role, permission=permission) for role in roles for permission in permissions[:5]]
+        )
+        RolePermission.objects.bulk_create([RolePermission(role=roles[0], permission=p) for p in permissions[5:]])
+        UserRole.objects.bulk_create([UserRole(user=user, role=role) for user in users for role in roles[:3]])
+        UserRole.objects.bulk_create([UserRole(user=users[0], role=role) for role in roles[3:]])
+
+        cls.fixtures = {"role": roles[0], "user": users[0]}
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+
+    def request(self, path):
+        match = resolve(path)
+        request = self.factory.get(path)
+        force_authenticate(request, user=self.admin)
+        response = match.func(request, **match.kwargs)
+        response.render()
+        return response
+
+    def test_admin_list_endpoints_stay_within_query_budget(self):
+        for url_name, url_kwargs in ADMIN_LIST_ENDPOINTS:
+            path = reverse(url_name, kwargs={name: self.fixtures[key].id for name, key in url_kwargs.items()})
+            with self.subTest(path=path):
+                budget = getattr(resolve(path).func.view_class, "query_budget", None)
+                self.assertIsNotNone(budget, f"{path} declares no query_budget")
+
+                # The warm-up keeps one-off costs (e.g. cold caches) out of the measurement.
+                self.request(path)
+                with self.assertNumQueries(budget):
+                    response = self.request(path)
+                self.assertEqual(response.status_code, 200)
@@ -0,0 +1,41 @@
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.accounts.utils.jwt_utils import parse_token
+from apps.common.throttling import EmailRateThrottle, IPRateThrottle, SlidingWindowRateThrottle
+
+
+class LoginIPThrottle(IPRateThrottle):
+    scope = "login"
+
+
+class LoginEmailThrottle(EmailRateThrottle):
+    scope = "login_email"
+
+
+class RegisterIPThrottle(IPRateThrottle):
+    scope = "register"
+
+
+class RefreshIPThrottle(IPRateThrottle):
+    scope = "refresh"
+
+
+class RefreshUserThrottle(SlidingWindowRateThrottle):
+    """Keyed by the user of the refresh token; checking its signature is cheap next to the database lookups."""
+
+    scope = "refresh_user"
+
+    def get_cache_key(self, request, view):
+        data = getattr(request, "data", None)
+        refresh_token = data.get("refresh_token") if isinstance(data, dict) else None
+        parsed = parse_token(refresh_token, RefreshToken) if isinstance(refresh_token, str) else None
+        # The refresh service reuses the verified token instead of checking the signature a second time.
+        request.parsed_refresh_token = parsed
+        if parsed is None or parsed.user_id is None:
+            return None
+        return self.cache_format % {"scope": self.scope, "ident": parsed.user_id}
+
+
+LOGIN_THROTTLES = [LoginIPThrottle, LoginEmailThrottle]
+REGISTER_THROTTLES = [RegisterIPThrottle]
+REFRESH_THROTTLES = [RefreshIPThrottle, RefreshUserThrottle]
@@ -1,34 +1,50 @@
+from django.conf import settings
 from django.urls import path
 
 from apps.accounts.views.admin import (
+    AdminExportView,
     PermissionDetailView,
     PermissionListView,
     RoleDetailView,
     RoleListView,
+    RolePermissionBulkView,
     RolePermissionDetailView,
     RolePermissionListView,
     UserListView,
+    UserRoleBulkView,
     UserRoleDetailView,
     UserRoleListView,
 )
 from apps.accounts.views.auth import (
+    AsyncLoginView,
+    AsyncRefreshTokenView,
     LoginView,
     LogoutView,
     RefreshTokenView,
     RegisterView,
 )
-from apps.accounts.views.rbac import PermissionCheckView
+from apps.accounts.views.rbac import AsyncPermissionCheckView, PermissionCheckView
 from apps.accounts.views.user import UserProfileView
 
 app_name = "accounts"
 
+# Under ASGI the async views serve the hot auth endpoints without a thread per request.
+if settings.ASYNC_AUTH_VIEWS_ENABLED:
+    login_view, refresh_token_view, permission_check_view = (
+        AsyncLoginView,
+        AsyncRefreshTokenView,
+        AsyncPermissionCheckView,
+    )
+else:
+    login_view, refresh_token_view, permission_check_view = LoginView, RefreshTokenView, PermissionCheckView
+
 urlpatterns = [
     path("auth/register/", RegisterView.as_view(), name="register"),
-    path("auth/login/", LoginView.as_view(), name="login"),
-    path("auth/refresh/", RefreshTokenView.as_view(), name="refresh-token"),
+    path("auth/login/", login_view.as_view(), name="login"),
+    path("auth/refresh/", refresh_token_view.as_view(), name="refresh-token"),
     path("auth/logout/", LogoutView.as_view(), name="logout"),
     path("users/me/", UserProfileView.as_view(), name="user-profile"),
-    path("permissions/check/", PermissionCheckView.as_view(), name="permission-check"),
+    path("permissions/check/", permission_check_view.as_view(), name="permission-check"),
     path("admin/roles/", RoleListView.as_view(), name="admin-role-list"),
     path("admin/roles/<int:role_id>/", RoleDetailView.as_view(), name="admin-role-detail"),
     path("admin/permissions/", PermissionListView.as_view(), name="admin-permission-list"),
@@ -38,4 +54,7 @@ urlpatterns = [
     path("admin/users/", UserListView.as_view(), name="admin-user-list"),
     path("admin/users/<int:user_id>/roles/", UserRoleListView.as_view(), name="admin-user-role-list"),
     path("admin/users/<int:user_id>/roles/<int:role_id>/", UserRoleDetailView.as_view(), name="admin-user-role-detail"),
+    path("admin/roles/permissions/bulk/", RolePermissionBulkView.as_view(), name="admin-role-permission-bulk"),
+    path("admin/users/roles/bulk/", UserRoleBulkView.as_view(), name="admin-user-role-bulk"),
+    path("admin/export/<str:resource>/", AdminExportView.as_view(), name="admin-export"),
 ]
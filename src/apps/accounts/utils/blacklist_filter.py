@@ -0,0 +1,135 @@
+import hashlib
+import math
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.accounts.models.auth import TokenBlacklist
+from apps.common.cache import bump_versions, is_shared_cache
+from apps.common.db import iterate_in_chunks
+
+BLACKLIST_VERSION_KEY = "auth:blacklist:version"
+
+# Ids are allocated before commit, so a short transaction can land below the highest id already seen.
+# Re-reading a small window of recent ids on every sync picks such rows up.
+ID_OVERLAP = 1000
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.size = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, item: str) -> None:
+        is_new = False
+        for position in self._positions(item):
+            mask = 1 << (position & 7)
+            if not self.bits[position >> 3] & mask:
+                self.bits[position >> 3] |= mask
+                is_new = True
+        if is_new:
+            self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class TokenBlacklistFilter:
+    """
+    Per-process negative lookup for blacklisted token jti values.
+
+    A jti missing from the bloom filter is definitely not blacklisted and is answered without a query;
+    hits are confirmed against the database. Workers re-sync at most every TOKEN_BLACKLIST_SYNC_INTERVAL
+    seconds, loading new rows only when the shared revocation version changed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._last_id = 0
+        self._version = None
+        self._synced_at = 0.0
+        self._built_at = 0.0
+
+    def is_blacklisted(self, token_jti: str) -> bool:
+        if token_jti not in self._sync():
+            return False
+        return TokenBlacklist.is_blacklisted(token_jti)
+
+    async def ais_blacklisted(self, token_jti: str) -> bool:
+        bloom = self._bloom
+        if self._is_stale(time.monotonic()):
+            # A re-sync is a bulk read guarded by a thread lock, so it runs in a worker thread.
+            bloom = await sync_to_async(self._sync)()
+        if token_jti not in bloom:
+            return False
+        return await TokenBlacklist.ais_blacklisted(token_jti)
+
+    def add(self, token_jti: str) -> None:
+        bloom = self._bloom
+        if bloom is not None:
+            bloom.add(token_jti)
+
+    def _sync(self) -> BloomFilter:
+        if not self._is_stale(time.monotonic()):
+            return self._bloom
+
+        with self._lock:
+            now = time.monotonic()
+            if not self._is_stale(now):
+                return self._bloom
+
+            version = cache.get(BLACKLIST_VERSION_KEY)
+            bloom = self._bloom
+            if (
+                bloom is None
+                or bloom.count >= bloom.capacity
+                or now - self._built_at >= settings.TOKEN_BLACKLIST_REBUILD_INTERVAL
+            ):
+                self._rebuild()
+                self._built_at = now
+            elif version != self._version or not is_shared_cache():
+                self._load(bloom, self._last_id - ID_OVERLAP)
+
+            self._version = version
+            self._synced_at = now
+            return self._bloom
+
+    def _is_stale(self, now: float) -> bool:
+        return self._bloom is None or now - self._synced_at >= settings.TOKEN_BLACKLIST_SYNC_INTERVAL
+
+    def _rebuild(self) -> None:
+        active = TokenBlacklist.objects.filter(expires_at__gt=timezone.now())
+        capacity = max(settings.TOKEN_BLACKLIST_FILTER_CAPACITY, active.count() * 2)
+        bloom = BloomFilter(capacity, settings.TOKEN_BLACKLIST_FILTER_ERROR_RATE)
+        self._last_id = 0
+        self._load(bloom, 0)
+        self._bloom = bloom
+
+    def _load(self, bloom: BloomFilter, after_id: int) -> None:
+        rows = TokenBlacklist.objects.filter(id__gt=after_id, expires_at__gt=timezone.now()).values_list(
+            "id", "token_jti"
+        )
+        for row_id, token_jti in iterate_in_chunks(rows, 5000):
+            bloom.add(token_jti)
+            self._last_id = max(self._last_id, row_id)
+
+
+def bump_blacklist_version() -> None:
+    bump_versions(BLACKLIST_VERSION_KEY)
+
+
+token_blacklist_filter = TokenBlacklistFilter()
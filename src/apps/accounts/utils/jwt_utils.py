@@ -1,71 +1,105 @@
-from datetime import datetime
-from typing import Any
+from datetime import UTC, datetime
+from typing import Any, NamedTuple
 
 from django.contrib.auth import get_user_model
-from django.utils import timezone
-from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken, Token
 
 from apps.accounts.models.auth import TokenBlacklist
+from apps.accounts.utils.blacklist_filter import bump_blacklist_version, token_blacklist_filter
 
 User = get_user_model()
 
 
+class ParsedToken(NamedTuple):
+    token: Token
+    jti: str | None
+    expires_at: datetime | None
+    user_id: int | None
+
+
 def generate_tokens(user: User) -> dict[str, str]:
     refresh = RefreshToken.for_user(user)
     access = refresh.access_token
-    
+
     return {
         "access_token": str(access),
         "refresh_token": str(refresh),
     }
 
 
-def decode_token(token: str) -> dict[str, Any] | None:
+def parse_validated_token(token: Token) -> ParsedToken:
+    """Read jti/exp/user_id from an already verified token without decoding it again."""
+    exp = token.payload.get("exp")
+    return ParsedToken(
+        token=token,
+        jti=token.payload.get(api_settings.JTI_CLAIM),
+        expires_at=datetime.fromtimestamp(exp, tz=UTC) if exp else None,
+        user_id=token.payload.get(api_settings.USER_ID_CLAIM),
+    )
+
+
+def parse_token(token: str | bytes, token_class: type[Token] = AccessToken) -> ParsedToken | None:
+    """Verify the signature once and return every claim the auth flow needs."""
     try:
-        access_token = AccessToken(token)
-        return access_token.payload
-    except Exception:
+        return parse_validated_token(token_class(token))
+    except TokenError:
         return None
 
 
+def decode_token(token: str) -> dict[str, Any] | None:
+    parsed = parse_token(token)
+    return parsed.token.payload if parsed else None
+
+
 def get_token_jti(token: str) -> str | None:
-    payload = decode_token(token)
-    if payload:
-        return payload.get("jti")
-    return None
+    parsed = parse_token(token)
+    return parsed.jti if parsed else None
 
 
 def get_token_expires_at(token: str) -> datetime | None:
-    payload = decode_token(token)
-    if payload:
-        exp = payload.get("exp")
-        if exp:
-            return datetime.fromtimestamp(exp, tz=timezone.utc)
-    return None
-
-
-def add_token_to_blacklist(token: str, user) -> TokenBlacklist | None:
-    jti = get_token_jti(token)
-    expires_at = get_token_expires_at(token)
-    
-    if not jti or not expires_at:
+    parsed = parse_token(token)
+    return parsed.expires_at if parsed else None
+
+
+def blacklist_parsed_token(parsed: ParsedToken, user) -> TokenBlacklist | None:
+    if not parsed.jti or not parsed.expires_at:
         return None
-    
-    if TokenBlacklist.is_blacklisted(jti):
-        return TokenBlacklist.objects.get(token_jti=jti)
-    
-    blacklisted_token = TokenBlacklist.objects.create(
-        token_jti=jti,
-        user=user,
-        expires_at=expires_at,
+
+    blacklisted_token, created = TokenBlacklist.objects.get_or_create(
+        token_jti=parsed.jti,
+        defaults={"user": user, "expires_at": parsed.expires_at},
     )
-    
+    if created:
+        token_blacklist_filter.add(parsed.jti)
+        bump_blacklist_version()
+
     return blacklisted_token
 
 
-def is_token_blacklisted(token: str) -> bool:
-    jti = get_token_jti(token)
+def add_token_to_blacklist(token: str, user, token_class: type[Token] = AccessToken) -> TokenBlacklist | None:
+    parsed = parse_token(token, token_class)
+    if not parsed:
+        return None
+
+    return blacklist_parsed_token(parsed, user)
+
+
+def is_jti_blacklisted(jti: str | None) -> bool:
     if not jti:
         return False
-    
-    return TokenBlacklist.is_blacklisted(jti)
+
+    return token_blacklist_filter.is_blacklisted(jti)
+
+
+async def ais_jti_blacklisted(jti: str | None) -> bool:
+    if not jti:
+        return False
+
+    return await token_blacklist_filter.ais_blacklisted(jti)
+
+
+def is_token_blacklisted(token: str, token_class: type[Token] = AccessToken) -> bool:
+    parsed = parse_token(token, token_class)
+    return is_jti_blacklisted(parsed.jti if parsed else None)
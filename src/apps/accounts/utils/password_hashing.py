@@ -0,0 +1,152 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+import django
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.hashers import make_password, verify_password
+from rest_framework.exceptions import Throttled
+
+
+class PasswordHashingBusy(Throttled):
+    default_detail = "Слишком много одновременных входов."
+    extra_detail_singular = extra_detail_plural = "Повторите через {wait} с."
+
+
+def _init_worker() -> None:
+    # Workers are spawned, not forked from a threaded gunicorn process, so Django is set up from scratch.
+    django.setup(set_prefix=False)
+
+
+def _hash_password(password: str) -> str:
+    return make_password(password)
+
+
+def _verify_password(password: str, encoded: str) -> tuple[bool, bool]:
+    return verify_password(password, encoded)
+
+
+class PasswordHashingPool:
+    """
+    Bounded process pool for password hashing and verification.
+
+    PBKDF2 takes hundreds of milliseconds of CPU, so it runs in PASSWORD_HASHING_WORKERS processes instead of
+    request threads. At most PASSWORD_HASHING_QUEUE_SIZE more calls wait for a free worker; beyond that the
+    caller gets PasswordHashingBusy (429 with Retry-After) right away, so a login burst can't hold every thread.
+    With PASSWORD_HASHING_WORKERS = 0 hashing runs inline, as Django does it; async callers still move it
+    off the event loop, into a thread.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._executor = None
+        self._slots = None
+        self._pid = None
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.busy_seconds = 0.0
+
+    def hash_password(self, password: str) -> str:
+        return self._run(_hash_password, password)
+
+    def verify_password(self, password: str, encoded: str) -> tuple[bool, bool]:
+        return self._run(_verify_password, password, encoded)
+
+    async def ahash_password(self, password: str) -> str:
+        return await self._arun(_hash_password, password)
+
+    async def averify_password(self, password: str, encoded: str) -> tuple[bool, bool]:
+        return await self._arun(_verify_password, password, encoded)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "workers": settings.PASSWORD_HASHING_WORKERS,
+            "queue_size": settings.PASSWORD_HASHING_QUEUE_SIZE,
+            "in_flight": self.submitted - self.completed,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "iterations": settings.PASSWORD_HASH_ITERATIONS,
+        }
+
+    def _run(self, func, *args):
+        if not settings.PASSWORD_HASHING_WORKERS:
+            return func(*args)
+        return self._submit(func, *args).result()
+
+    async def _arun(self, func, *args):
+        if not settings.PASSWORD_HASHING_WORKERS:
+            return await sync_to_async(func, thread_sensitive=False)(*args)
+        return await asyncio.wrap_future(self._submit(func, *args))
+
+    def _submit(self, func, *args) -> Future:
+        executor, slots = self._get_executor()
+        if not slots.acquire(blocking=False):
+            with self._stats_lock:
+                self.rejected += 1
+            raise PasswordHashingBusy(wait=settings.PASSWORD_HASHING_RETRY_AFTER)
+
+        started = time.monotonic()
+        try:
+            future = executor.submit(func, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed): replace the pool and retry once.
+            executor = self._reset_executor(executor)
+            try:
+                future = executor.submit(func, *args)
+            except BaseException:
+                slots.release()
+                raise
+        except BaseException:
+            slots.release()
+            raise
+
+        with self._stats_lock:
+            self.submitted += 1
+
+        def on_done(_):
+            slots.release()
+            with self._stats_lock:
+                self.completed += 1
+                self.busy_seconds += time.monotonic() - started
+
+        future.add_done_callback(on_done)
+        return future
+
+    def _get_executor(self) -> tuple[ProcessPoolExecutor, threading.BoundedSemaphore]:
+        # A pool created before gunicorn forked belongs to the master, so each worker process builds its own.
+        if self._executor is None or self._pid != os.getpid():
+            with self._lock:
+                if self._executor is None or self._pid != os.getpid():
+                    self._executor = self._new_executor()
+                    self._slots = threading.BoundedSemaphore(
+                        settings.PASSWORD_HASHING_WORKERS + settings.PASSWORD_HASHING_QUEUE_SIZE
+                    )
+                    self._pid = os.getpid()
+        return self._executor, self._slots
+
+    def _reset_executor(self, broken: ProcessPoolExecutor) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is broken:
+                broken.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._new_executor()
+            return self._executor
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=settings.PASSWORD_HASHING_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+
+
+password_hashing_pool = PasswordHashingPool()
@@ -0,0 +1,51 @@
+from collections.abc import Iterable, Iterator
+
+from apps.accounts.models.rbac import PermissionAction
+
+SEPARATOR = "."
+WILDCARD = PermissionAction.ALL.value
+
+
+def is_wildcard(code: str) -> bool:
+    return code == WILDCARD or code.endswith(SEPARATOR + WILDCARD)
+
+
+class PermissionGrants:
+    """
+    Permission codes granted to one user, usable like the frozenset it replaces (`code in grants`, iteration).
+
+    Wildcard grants ("blog.*", "blog.post.*", "*") are compiled into a trie of code segments, so a code not
+    granted exactly is resolved in O(depth). A wildcard covers every code strictly under its prefix:
+    "blog.*" grants "blog.post.create" but not "blog".
+    """
+
+    __slots__ = ("codes", "_trie")
+
+    def __init__(self, codes: Iterable[str]):
+        self.codes = frozenset(codes)
+        self._trie = {}
+        for code in self.codes:
+            if is_wildcard(code):
+                node = self._trie
+                for segment in code.split(SEPARATOR)[:-1]:
+                    node = node.setdefault(segment, {})
+                node[WILDCARD] = True
+
+    def __contains__(self, code: str) -> bool:
+        if code in self.codes:
+            return True
+
+        node = self._trie
+        for segment in code.split(SEPARATOR)[:-1]:
+            if WILDCARD in node:
+                return True
+            node = node.get(segment)
+            if node is None:
+                return False
+        return WILDCARD in node
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.codes)
+
+    def __len__(self) -> int:
+        return len(self.codes)
@@ -0,0 +1,85 @@
+import threading
+import time
+from typing import NamedTuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.accounts.models.rbac import Permission
+from apps.common.cache import bump_versions, is_shared_cache
+
+PERMISSION_REGISTRY_VERSION_KEY = "rbac:permission-registry:version"
+
+
+class PermissionEntry(NamedTuple):
+    id: int
+    resource_type: str
+    action: str
+
+
+class PermissionRegistry:
+    """
+    Per-process map of permission code -> (id, resource_type, action).
+
+    The permissions table is small and almost static, so it is loaded once on first use and answers lookups,
+    including rejecting unknown codes, without a query. Workers re-check the shared version at most every
+    PERMISSION_REGISTRY_SYNC_INTERVAL seconds and reload the table only when it was bumped.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = None
+        self._version = None
+        self._synced_at = 0.0
+
+    def get(self, code: str) -> PermissionEntry | None:
+        return self._sync().get(code)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self._sync()
+
+    async def aget(self, code: str) -> PermissionEntry | None:
+        entries = self._entries
+        if self._is_stale(entries, time.monotonic()):
+            # A reload is a table read guarded by a thread lock, so it runs in a worker thread.
+            entries = await sync_to_async(self._sync)()
+        return entries.get(code)
+
+    def reset(self) -> None:
+        # The next lookup reloads; used by the process that made the change so it sees it at once.
+        self._entries = None
+
+    def _sync(self) -> dict[str, PermissionEntry]:
+        entries = self._entries
+        if not self._is_stale(entries, time.monotonic()):
+            return entries
+
+        with self._lock:
+            now = time.monotonic()
+            if not self._is_stale(self._entries, now):
+                return self._entries
+
+            version = cache.get(PERMISSION_REGISTRY_VERSION_KEY)
+            if self._entries is None or version != self._version or not is_shared_cache():
+                self._entries = self._load()
+
+            self._version = version
+            self._synced_at = now
+            return self._entries
+
+    def _is_stale(self, entries: dict | None, now: float) -> bool:
+        return entries is None or now - self._synced_at >= settings.PERMISSION_REGISTRY_SYNC_INTERVAL
+
+    def _load(self) -> dict[str, PermissionEntry]:
+        rows = Permission.objects.values_list("code", "id", "resource_type", "action")
+        return {code: PermissionEntry(*entry) for code, *entry in rows}
+
+
+def invalidate_permission_registry() -> None:
+    bump_versions(PERMISSION_REGISTRY_VERSION_KEY)
+    transaction.on_commit(permission_registry.reset)
+
+
+permission_registry = PermissionRegistry()
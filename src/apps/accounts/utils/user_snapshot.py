@@ -0,0 +1,78 @@
+from typing import Any
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS
+
+from apps.accounts.models.rbac import UserRole
+from apps.common.cache import aget_or_set, aget_versions, bump_versions, get_or_set, get_versions
+
+User = get_user_model()
+
+USER_SNAPSHOT_VERSION_KEY = "auth:user-snapshot:{user_id}:version"
+USER_SNAPSHOT_KEY = "auth:user-snapshot:{user_id}:{version}"
+SNAPSHOT_FIELDS = ("id", "email", "is_active", "deleted_at", "updated_at")
+
+
+def load_user_snapshot(user_id: int) -> dict[str, Any] | None:
+    snapshot = User.objects.filter(pk=user_id).values(*SNAPSHOT_FIELDS).first()
+    if snapshot is None:
+        return None
+
+    snapshot["role_ids"] = list(UserRole.objects.filter(user_id=user_id).values_list("role_id", flat=True))
+    return snapshot
+
+
+def get_user_snapshot(user_id: int) -> dict[str, Any] | None:
+    (version,) = get_versions(USER_SNAPSHOT_VERSION_KEY.format(user_id=user_id))
+    return get_or_set(
+        USER_SNAPSHOT_KEY.format(user_id=user_id, version=version),
+        lambda: load_user_snapshot(user_id),
+        settings.USER_SNAPSHOT_CACHE_TIMEOUT,
+        name="user_snapshot",
+    )
+
+
+async def aload_user_snapshot(user_id: int) -> dict[str, Any] | None:
+    snapshot = await User.objects.filter(pk=user_id).values(*SNAPSHOT_FIELDS).afirst()
+    if snapshot is None:
+        return None
+
+    role_ids = UserRole.objects.filter(user_id=user_id).values_list("role_id", flat=True)
+    snapshot["role_ids"] = [role_id async for role_id in role_ids]
+    return snapshot
+
+
+async def aget_user_snapshot(user_id: int) -> dict[str, Any] | None:
+    (version,) = await aget_versions(USER_SNAPSHOT_VERSION_KEY.format(user_id=user_id))
+    return await aget_or_set(
+        USER_SNAPSHOT_KEY.format(user_id=user_id, version=version),
+        lambda: aload_user_snapshot(user_id),
+        settings.USER_SNAPSHOT_CACHE_TIMEOUT,
+        name="user_snapshot",
+    )
+
+
+def user_from_snapshot(snapshot: dict[str, Any]) -> User:
+    """
+    Build a User instance from a cached snapshot.
+
+    Fields outside the snapshot are deferred: Django loads them on first access, so views that need the
+    whole profile should call get_full_user instead of paying one query per field.
+    """
+    field_names = [field.attname for field in User._meta.concrete_fields if field.attname in SNAPSHOT_FIELDS]
+    user = User.from_db(DEFAULT_DB_ALIAS, field_names, [snapshot[name] for name in field_names])
+    user.snapshot_role_ids = frozenset(snapshot["role_ids"])
+    return user
+
+
+def get_full_user(user: User) -> User:
+    if user.get_deferred_fields():
+        return User.objects.get(pk=user.pk)
+    return user
+
+
+def invalidate_user_snapshot(*user_ids: int) -> None:
+    # A version bump rather than a delete: a loader that read the old rows before the commit
+    # stores its result under the old version, where nobody looks any more.
+    bump_versions(*[USER_SNAPSHOT_VERSION_KEY.format(user_id=user_id) for user_id in user_ids])
@@ -1,7 +1,12 @@
+from django.db import transaction
+from django.db.models import Count, Prefetch
+from django.http import StreamingHttpResponse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.generics import ListCreateAPIView, RetrieveUpdateDestroyAPIView, ListAPIView, CreateAPIView, DestroyAPIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
 from apps.accounts.models.rbac import Permission, Role, RolePermission, UserRole
 from apps.accounts.models.user import User
@@ -11,19 +16,42 @@ from apps.accounts.serializers.admin import (
     PermissionCreateSerializer,
     PermissionSerializer,
     RoleCreateSerializer,
+    BULK_ACTION_ASSIGN,
     RolePermissionAssignSerializer,
+    RolePermissionBulkSerializer,
     RolePermissionSerializer,
     RoleSerializer,
     UserRoleAssignSerializer,
+    UserRoleBulkSerializer,
     UserRoleSerializer,
 )
-from apps.common.exceptions import BusinessLogicException, ResourceNotFoundException
+from apps.accounts.services.export_service import (
+    EXPORT_CONTENT_TYPES,
+    EXPORT_FORMAT_NDJSON,
+    EXPORT_RESOURCES,
+    stream_export,
+)
+from apps.accounts.services.rbac_service import (
+    bulk_assign_role_permissions,
+    bulk_assign_user_roles,
+    bulk_remove_role_permissions,
+    bulk_remove_user_roles,
+    on_role_permissions_changed,
+    on_user_roles_changed,
+)
+from apps.accounts.utils.permission_registry import invalidate_permission_registry
+from apps.common.exceptions import BusinessLogicException, ResourceNotFoundException, ValidationException
+from apps.common.mixins.view_mixins import ConditionalListMixin, ConditionalRetrieveMixin
+from apps.common.pagination import KeysetPagination
 
 
-class RoleListView(ListCreateAPIView):
-    queryset = Role.objects.all().order_by("name")
+class RoleListView(ConditionalListMixin, ListCreateAPIView):
+    queryset = Role.objects.annotate(permissions_count=Count("role_permissions", distinct=True))
     serializer_class = RoleSerializer
     permission_classes = [IsAuthenticated, IsAdmin]
+    pagination_class = KeysetPagination
+    cursor_ordering = ("name", "id")
+    query_budget = 2
 
     def get_serializer_class(self):
         if self.request.method == "POST":
@@ -38,8 +66,8 @@ class RoleListView(ListCreateAPIView):
         return Response(response_serializer.data, status=status.HTTP_201_CREATED)
 
 
-class RoleDetailView(RetrieveUpdateDestroyAPIView):
-    queryset = Role.objects.all()
+class RoleDetailView(ConditionalRetrieveMixin, RetrieveUpdateDestroyAPIView):
+    queryset = Role.objects.annotate(permissions_count=Count("role_permissions", distinct=True))
     serializer_class = RoleSerializer
     permission_classes = [IsAuthenticated, IsAdmin]
     lookup_field = "role_id"
@@ -49,6 +77,13 @@ class RoleDetailView(RetrieveUpdateDestroyAPIView):
             return RoleCreateSerializer
         return RoleSerializer
 
+    def get_etag_parts(self, obj):
+        # permissions_count changes without touching the role's updated_at.
+        return (*super().get_etag_parts(obj), obj.permissions_count)
+
+    def get_last_modified(self, obj):
+        return None
+
     def get_object(self):
         try:
             return self.get_queryset().get(id=self.kwargs["role_id"])
@@ -76,11 +111,19 @@ class RoleDetailView(RetrieveUpdateDestroyAPIView):
             )
         return super().destroy(request, *args, **kwargs)
 
+    def perform_destroy(self, instance):
+        user_ids = list(instance.user_roles.values_list("user_id", flat=True))
+        instance.delete()
+        on_user_roles_changed(*user_ids)
+
 
-class PermissionListView(ListCreateAPIView):
-    queryset = Permission.objects.all().order_by("code")
+class PermissionListView(ConditionalListMixin, ListCreateAPIView):
+    queryset = Permission.objects.all()
     serializer_class = PermissionSerializer
     permission_classes = [IsAuthenticated, IsAdmin]
+    pagination_class = KeysetPagination
+    cursor_ordering = ("code", "id")
+    query_budget = 2
 
     def get_serializer_class(self):
         if self.request.method == "POST":
@@ -91,11 +134,12 @@ class PermissionListView(ListCreateAPIView):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         permission = serializer.save()
+        invalidate_permission_registry()
         response_serializer = PermissionSerializer(permission)
         return Response(response_serializer.data, status=status.HTTP_201_CREATED)
 
 
-class PermissionDetailView(RetrieveUpdateDestroyAPIView):
+class PermissionDetailView(ConditionalRetrieveMixin, RetrieveUpdateDestroyAPIView):
     queryset = Permission.objects.all()
     serializer_class = PermissionSerializer
     permission_classes = [IsAuthenticated, IsAdmin]
@@ -120,19 +164,29 @@ class PermissionDetailView(RetrieveUpdateDestroyAPIView):
         instance = self.get_object()
         serializer = self.get_serializer(instance, data=request.data, partial=partial)
         serializer.is_valid(raise_exception=True)
+        old_code = instance.code
         updated_permission = serializer.save()
+        on_role_permissions_changed(permission_codes={old_code, updated_permission.code})
+        invalidate_permission_registry()
         response_serializer = PermissionSerializer(updated_permission)
         return Response(response_serializer.data, status=status.HTTP_200_OK)
 
+    def perform_destroy(self, instance):
+        code = instance.code
+        instance.delete()
+        on_role_permissions_changed(permission_codes=[code])
+        invalidate_permission_registry()
+
 
 class RolePermissionListView(ListCreateAPIView):
     serializer_class = RolePermissionSerializer
     permission_classes = [IsAuthenticated, IsAdmin]
+    query_budget = 4
 
     def get_queryset(self):
         role_id = self.kwargs["role_id"]
         role = self.get_role(role_id)
-        return RolePermission.objects.filter(role=role).select_related("permission")
+        return RolePermission.objects.filter(role=role).select_related("permission").order_by("id")
 
     def get_role(self, role_id):
         try:
@@ -163,6 +217,8 @@ class RolePermissionListView(ListCreateAPIView):
             )
 
         role_permission, created = RolePermission.objects.get_or_create(role=role, permission=permission)
+        if created:
+            on_role_permissions_changed(role_ids=[role.id], permission_codes=[permission.code])
         response_serializer = RolePermissionSerializer(role_permission)
         return Response(response_serializer.data, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
 
@@ -201,21 +257,51 @@ class RolePermissionDetailView(DestroyAPIView):
 
         return role_permission
 
+    def perform_destroy(self, instance):
+        role_id, permission_code = instance.role_id, instance.permission.code
+        instance.delete()
+        on_role_permissions_changed(role_ids=[role_id], permission_codes=[permission_code])
+
+
+class RolePermissionBulkView(CreateAPIView):
+    serializer_class = RolePermissionBulkSerializer
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
 
-class UserListView(ListAPIView):
-    queryset = User.objects.filter(is_active=True, deleted_at__isnull=True).order_by("email")
+        pairs = serializer.validated_data["items"]
+        permission_codes = serializer.validated_data["permission_codes"]
+        with transaction.atomic():
+            if serializer.validated_data["action"] == BULK_ACTION_ASSIGN:
+                result = {"created": bulk_assign_role_permissions(pairs, permission_codes)}
+            else:
+                result = {"deleted": bulk_remove_role_permissions(pairs, permission_codes)}
+
+        return Response(result, status=status.HTTP_200_OK)
+
+
+class UserListView(ConditionalListMixin, ListAPIView):
+    queryset = User.objects.filter(is_active=True, deleted_at__isnull=True).prefetch_related(
+        Prefetch("user_roles", queryset=UserRole.objects.select_related("role"))
+    )
     serializer_class = AdminUserSerializer
     permission_classes = [IsAuthenticated, IsAdmin]
+    pagination_class = KeysetPagination
+    cursor_ordering = ("email", "id")
+    query_budget = 3
 
 
 class UserRoleListView(ListCreateAPIView):
     serializer_class = UserRoleSerializer
     permission_classes = [IsAuthenticated, IsAdmin]
+    query_budget = 4
 
     def get_queryset(self):
         user_id = self.kwargs["user_id"]
         user = self.get_user(user_id)
-        return UserRole.objects.filter(user=user).select_related("role")
+        return UserRole.objects.filter(user=user).select_related("role", "user").order_by("id")
 
     def get_user(self, user_id):
         try:
@@ -250,10 +336,30 @@ class UserRoleListView(ListCreateAPIView):
             role=role,
             defaults={"assigned_by": request.user},
         )
+        if created:
+            on_user_roles_changed(user.id)
         response_serializer = UserRoleSerializer(user_role)
         return Response(response_serializer.data, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
 
 
+class UserRoleBulkView(CreateAPIView):
+    serializer_class = UserRoleBulkSerializer
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        pairs = serializer.validated_data["items"]
+        with transaction.atomic():
+            if serializer.validated_data["action"] == BULK_ACTION_ASSIGN:
+                result = {"created": bulk_assign_user_roles(pairs, assigned_by=request.user)}
+            else:
+                result = {"deleted": bulk_remove_user_roles(pairs)}
+
+        return Response(result, status=status.HTTP_200_OK)
+
+
 class UserRoleDetailView(DestroyAPIView):
     permission_classes = [IsAuthenticated, IsAdmin]
 
@@ -293,3 +399,35 @@ class UserRoleDetailView(DestroyAPIView):
         instance.user.remove_role(instance.role)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+
+class AdminExportView(APIView):
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request, resource):
+        if resource not in EXPORT_RESOURCES:
+            raise ResourceNotFoundException(
+                message="Неизвестный тип выгрузки",
+                errors=[{"code": "export_not_found", "detail": f"Доступные выгрузки: {', '.join(EXPORT_RESOURCES)}"}],
+            )
+
+        # "format" is reserved by DRF for renderer negotiation, hence "output".
+        export_format = request.query_params.get("output", EXPORT_FORMAT_NDJSON)
+        if export_format not in EXPORT_CONTENT_TYPES:
+            raise ValidationException(
+                message="Неподдерживаемый формат выгрузки",
+                errors=[
+                    {
+                        "code": "invalid_choice",
+                        "detail": f"Допустимые форматы: {', '.join(EXPORT_CONTENT_TYPES)}",
+                        "attr": "output",
+                    }
+                ],
+            )
+
+        response = StreamingHttpResponse(
+            stream_export(resource, export_format),
+            content_type=EXPORT_CONTENT_TYPES[export_format],
+        )
+        filename = f"{resource}-{timezone.now():%Y%m%d-%H%M%S}.{export_format}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
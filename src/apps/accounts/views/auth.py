@@ -10,11 +10,15 @@ from apps.accounts.serializers.auth import (
     RegisterSerializer,
 )
 from apps.accounts.serializers.user import UserSerializer
+from apps.accounts.services.auth_service import aauthenticate_user, arefresh_access_token
+from apps.accounts.throttling import LOGIN_THROTTLES, REFRESH_THROTTLES, REGISTER_THROTTLES
+from apps.common.views import AsyncAPIView
 
 
 class RegisterView(CreateAPIView):
     serializer_class = RegisterSerializer
     permission_classes = [AllowAny]
+    throttle_classes = REGISTER_THROTTLES
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -33,6 +37,7 @@ class RegisterView(CreateAPIView):
 class LoginView(CreateAPIView):
     serializer_class = LoginSerializer
     permission_classes = [AllowAny]
+    throttle_classes = LOGIN_THROTTLES
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -51,6 +56,7 @@ class LoginView(CreateAPIView):
 class RefreshTokenView(CreateAPIView):
     serializer_class = RefreshTokenSerializer
     permission_classes = [AllowAny]
+    throttle_classes = REFRESH_THROTTLES
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -71,3 +77,31 @@ class LogoutView(CreateAPIView):
 
         return Response(result, status=status.HTTP_200_OK)
 
+
+class AsyncLoginView(AsyncAPIView):
+    """LoginView for ASGI: same request and response, password hashing runs off the event loop."""
+
+    throttle_classes = LOGIN_THROTTLES
+
+    async def post(self, request, data):
+        serializer = LoginSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        user, tokens = await aauthenticate_user(**serializer.validated_data)
+
+        return {
+            "user": UserSerializer(user).data,
+            "tokens": tokens,
+        }
+
+
+class AsyncRefreshTokenView(AsyncAPIView):
+    throttle_classes = REFRESH_THROTTLES
+
+    async def post(self, request, data):
+        serializer = RefreshTokenSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        access_token = await arefresh_access_token(
+            serializer.validated_data["refresh_token"], getattr(request, "parsed_refresh_token", None)
+        )
+
+        return {"access_token": access_token}
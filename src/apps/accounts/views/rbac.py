@@ -3,8 +3,10 @@ from rest_framework.generics import CreateAPIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from apps.accounts.authentication import CustomJWTAuthentication
 from apps.accounts.serializers.rbac import PermissionCheckRequestSerializer
-from apps.common.permissions import check_permissions
+from apps.common.permissions import acheck_permissions, check_permissions
+from apps.common.views import AsyncAPIView
 
 
 class PermissionCheckView(CreateAPIView):
@@ -20,3 +22,13 @@ class PermissionCheckView(CreateAPIView):
 
         return Response(result, status=status.HTTP_200_OK)
 
+
+class AsyncPermissionCheckView(AsyncAPIView):
+    authentication_classes = [CustomJWTAuthentication]
+    authentication_required = True
+
+    async def post(self, request, data):
+        serializer = PermissionCheckRequestSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+
+        return await acheck_permissions(user=request.user, permission_codes=serializer.validated_data["actions"])
@@ -5,15 +5,24 @@ from rest_framework.response import Response
 
 from apps.accounts.serializers.user import UserProfileSerializer, UserUpdateSerializer
 from apps.accounts.services.user_service import soft_delete_user
+from apps.accounts.utils.user_snapshot import get_full_user
+from apps.common.mixins.view_mixins import ConditionalRetrieveMixin
 
 
-class UserProfileView(RetrieveUpdateDestroyAPIView):
+class UserProfileView(ConditionalRetrieveMixin, RetrieveUpdateDestroyAPIView):
     serializer_class = UserProfileSerializer
     permission_classes = [IsAuthenticated]
 
     def get_object(self):
+        return get_full_user(self.request.user)
+
+    def get_conditional_object(self):
+        # A snapshot user already carries updated_at, so a 304 needs no users query.
         return self.request.user
 
+    def get_object_for_response(self, obj):
+        return get_full_user(obj)
+
     def get_serializer_class(self):
         if self.request.method in ["PUT", "PATCH"]:
             return UserUpdateSerializer
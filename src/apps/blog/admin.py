@@ -0,0 +1,34 @@
+from django.contrib import admin
+from django.utils.translation import gettext_lazy as _
+
+from apps.blog.models import Post
+from apps.blog.search import update_search_vectors
+from apps.blog.services import POSTS_RESPONSE_CACHE_NAMESPACE
+from apps.common.response_cache import invalidate_response_cache
+
+
+@admin.register(Post)
+class PostAdmin(admin.ModelAdmin):
+    list_display = ["title", "author", "created_at", "updated_at"]
+    list_filter = ["created_at"]
+    search_fields = ["title", "author__email"]
+    autocomplete_fields = ["author"]
+    readonly_fields = ["created_at", "updated_at"]
+
+    fieldsets = (
+        (None, {"fields": ("title", "content", "author")}),
+        (_("Timestamps"), {"fields": ("created_at", "updated_at")}),
+    )
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        update_search_vectors(Post.objects.filter(pk=obj.pk))
+        invalidate_response_cache(POSTS_RESPONSE_CACHE_NAMESPACE)
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        invalidate_response_cache(POSTS_RESPONSE_CACHE_NAMESPACE)
+
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        invalidate_response_cache(POSTS_RESPONSE_CACHE_NAMESPACE)
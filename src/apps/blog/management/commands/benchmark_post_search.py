@@ -0,0 +1,109 @@
+import itertools
+import random
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.blog.models import Post
+from apps.blog.search import is_postgres, post_search_index, update_search_vectors
+from apps.blog.services import get_posts
+
+User = get_user_model()
+
+# Larger corpora take minutes and gigabytes of WAL even though the transaction is rolled back: they need --yes.
+DEFAULT_POSTS = 10_000
+
+SYLLABLES = ["ка", "ро", "ми", "ле", "на", "то", "вы", "су", "да", "пе", "ри", "ло", "ва", "ко", "зе", "ну"]
+
+
+def build_vocabulary(rng, size):
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+class Command(BaseCommand):
+    help = (
+        "Генерирует корпус постов и сравнивает полнотекстовый поиск (?q=) с LIKE-сканированием. "
+        "Работает только при DEBUG=True; все записи откатываются в конце"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--posts",
+            type=int,
+            default=DEFAULT_POSTS,
+            help=f"Размер корпуса (по умолчанию: {DEFAULT_POSTS}); больший корпус требует --yes",
+        )
+        parser.add_argument("--yes", action="store_true", help=f"Подтвердить корпус больше {DEFAULT_POSTS} постов")
+        parser.add_argument("--queries", type=int, default=50, help="Количество поисковых запросов (по умолчанию: 50)")
+        parser.add_argument("--batch-size", type=int, default=10_000, help="Размер пачки вставки (по умолчанию: 10000)")
+        parser.add_argument("--seed", type=int, default=42, help="Seed генератора (по умолчанию: 42)")
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG:
+            raise CommandError("Бенчмарк пишет в базу данных и запускается только при DEBUG=True")
+        if options["posts"] > DEFAULT_POSTS and not options["yes"]:
+            raise CommandError(f"Корпус больше {DEFAULT_POSTS} постов нужно подтвердить флагом --yes")
+
+        rng = random.Random(options["seed"])
+        vocabulary = build_vocabulary(rng, 20_000)
+        # Zipf-like weights: a few frequent words and a long tail, as in real text.
+        cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(vocabulary))))
+
+        with transaction.atomic():
+            started = time.perf_counter()
+            self._create_corpus(rng, vocabulary, cum_weights, options["posts"], options["batch_size"])
+            self.stdout.write(f"Корпус {options['posts']} постов создан за {time.perf_counter() - started:.1f} с")
+
+            started = time.perf_counter()
+            if is_postgres():
+                self.stdout.write("Бэкенд: PostgreSQL (tsvector + GIN)")
+            else:
+                post_search_index.search(vocabulary[0])
+                self.stdout.write("Бэкенд: инвертированный индекс в памяти (fallback)")
+            self.stdout.write(f"Индексация: {time.perf_counter() - started:.1f} с")
+
+            queries = [
+                " ".join(rng.choices(vocabulary[50:2000], k=rng.randint(1, 2))) for _ in range(options["queries"])
+            ]
+            self._report("Полнотекстовый поиск", lambda q: list(get_posts(query=q)[:20]), queries)
+            self._report(
+                "LIKE '%q%' (до)",
+                lambda q: list(get_posts().filter(content__icontains=q.split()[0])[:20]),
+                queries,
+            )
+
+            transaction.set_rollback(True)
+
+    def _create_corpus(self, rng, vocabulary, cum_weights, posts_count, batch_size):
+        author = User.objects.create_user(email="benchmark-search@test.com", password=None)
+
+        for offset in range(0, posts_count, batch_size):
+            posts = Post.objects.bulk_create(
+                [
+                    Post(
+                        author=author,
+                        title=" ".join(rng.choices(vocabulary, cum_weights=cum_weights, k=rng.randint(3, 8))),
+                        content=" ".join(rng.choices(vocabulary, cum_weights=cum_weights, k=rng.randint(30, 120))),
+                    )
+                    for _ in range(min(batch_size, posts_count - offset))
+                ]
+            )
+            update_search_vectors(Post.objects.filter(id__gte=posts[0].id, author=author))
+
+    def _report(self, label, search, queries):
+        timings = []
+        for query in queries:
+            started = time.perf_counter()
+            search(query)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        timings.sort()
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        self.stdout.write(f"{label}: p50 {statistics.median(timings):.1f} мс, p95 {p95:.1f} мс")
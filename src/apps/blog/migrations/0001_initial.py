@@ -0,0 +1,34 @@
+# Generated by Django 5.2.3 on 2026-10-17 06:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Post',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated at')),
+                ('title', models.CharField(max_length=200, verbose_name='title')),
+                ('content', models.TextField(verbose_name='content')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='posts', to=settings.AUTH_USER_MODEL, verbose_name='author')),
+            ],
+            options={
+                'verbose_name': 'post',
+                'verbose_name_plural': 'posts',
+                'db_table': 'posts',
+                'indexes': [models.Index(fields=['author'], name='posts_author__aaae70_idx'), models.Index(fields=['created_at'], name='posts_created_060265_idx')],
+            },
+        ),
+    ]
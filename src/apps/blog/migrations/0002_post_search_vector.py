@@ -0,0 +1,44 @@
+# Generated by Django 5.2.3 on 2026-10-17 06:29
+
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+SEARCH_INDEX_NAME = "posts_search_vector_gin"
+
+
+def create_search_index(apps, schema_editor):
+    # GIN and to_tsvector exist only on PostgreSQL; other backends use the in-memory fallback index.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute(
+        "UPDATE posts SET search_vector = "
+        "setweight(to_tsvector(%s::regconfig, coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector(%s::regconfig, coalesce(content, '')), 'B')",
+        params=[settings.BLOG_SEARCH_CONFIG, settings.BLOG_SEARCH_CONFIG],
+    )
+    schema_editor.execute(f"CREATE INDEX IF NOT EXISTS {SEARCH_INDEX_NAME} ON posts USING gin (search_vector)")
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute(f"DROP INDEX IF EXISTS {SEARCH_INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True, verbose_name='search vector'),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,27 @@
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from apps.common.mixins.model_mixins import TimestampMixin
+
+
+class Post(TimestampMixin):
+    title = models.CharField(_("title"), max_length=200)
+    content = models.TextField(_("content"))
+    author = models.ForeignKey(
+        "accounts.User", on_delete=models.CASCADE, related_name="posts", verbose_name=_("author")
+    )
+    # Maintained by apps.blog.services on write; the GIN index is created by migration 0002 on PostgreSQL only.
+    search_vector = SearchVectorField(_("search vector"), null=True, editable=False)
+
+    class Meta:
+        verbose_name = _("post")
+        verbose_name_plural = _("posts")
+        db_table = "posts"
+        indexes = [
+            models.Index(fields=["author"]),
+            models.Index(fields=["created_at"]),
+        ]
+
+    def __str__(self):
+        return self.title
@@ -0,0 +1,111 @@
+import re
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import Case, Count, F, IntegerField, Max, QuerySet, When
+
+from apps.blog.models import Post
+
+TITLE_WEIGHT = 1.0
+CONTENT_WEIGHT = 0.4
+# The fallback orders results with a CASE over ids, so the ranked list is capped to stay within sqlite limits.
+FALLBACK_MAX_RESULTS = 1000
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+def is_postgres() -> bool:
+    return connection.vendor == "postgresql"
+
+
+def post_search_vector() -> SearchVector:
+    config = settings.BLOG_SEARCH_CONFIG
+    return SearchVector("title", weight="A", config=config) + SearchVector("content", weight="B", config=config)
+
+
+def update_search_vectors(queryset: QuerySet[Post]) -> int:
+    """Recompute search_vector for the queryset in one UPDATE; a no-op outside PostgreSQL."""
+    if not is_postgres():
+        return 0
+    return queryset.update(search_vector=post_search_vector())
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+class PostSearchIndex:
+    """
+    In-memory inverted index used where PostgreSQL full-text search is unavailable (the sqlite local setup).
+
+    Terms are lowercased words; every query term must match (AND), and posts are ranked by term frequency
+    with title hits weighted above content hits. The index is rebuilt when the posts table changes, which is
+    detected by comparing row count and the latest updated_at.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: dict[str, dict[int, float]] = {}
+        self._signature = None
+
+    def search(self, query: str) -> list[int]:
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        postings = self._sync()
+        term_postings = [postings.get(term, {}) for term in dict.fromkeys(terms)]
+        term_postings.sort(key=len)
+
+        scores = dict(term_postings[0])
+        for posting in term_postings[1:]:
+            scores = {post_id: score + posting[post_id] for post_id, score in scores.items() if post_id in posting}
+
+        return sorted(scores, key=lambda post_id: (-scores[post_id], -post_id))
+
+    def _sync(self) -> dict[str, dict[int, float]]:
+        signature = tuple(Post.objects.aggregate(count=Count("id"), updated=Max("updated_at")).values())
+        if signature == self._signature:
+            return self._postings
+
+        with self._lock:
+            if signature != self._signature:
+                self._postings = self._build()
+                self._signature = signature
+            return self._postings
+
+    def _build(self) -> dict[str, dict[int, float]]:
+        postings = defaultdict(lambda: defaultdict(float))
+        for post_id, title, content in Post.objects.values_list("id", "title", "content").iterator(chunk_size=5000):
+            for term in tokenize(title):
+                postings[term][post_id] += TITLE_WEIGHT
+            for term in tokenize(content):
+                postings[term][post_id] += CONTENT_WEIGHT
+        return {term: dict(posting) for term, posting in postings.items()}
+
+
+post_search_index = PostSearchIndex()
+
+
+def search_posts(queryset: QuerySet[Post], query: str) -> QuerySet[Post]:
+    """Filter queryset to posts matching query, best matches first."""
+    if is_postgres():
+        search_query = SearchQuery(query, search_type="websearch", config=settings.BLOG_SEARCH_CONFIG)
+        return (
+            queryset.filter(search_vector=search_query)
+            .annotate(rank=SearchRank(F("search_vector"), search_query))
+            .order_by("-rank", "-id")
+        )
+
+    post_ids = post_search_index.search(query)[:FALLBACK_MAX_RESULTS]
+    if not post_ids:
+        return queryset.none()
+
+    ordering = Case(
+        *[When(id=post_id, then=position) for position, post_id in enumerate(post_ids)],
+        output_field=IntegerField(),
+    )
+    return queryset.filter(id__in=post_ids).order_by(ordering)
@@ -5,9 +5,9 @@ class PostSerializer(serializers.Serializer):
     id = serializers.IntegerField(read_only=True)
     title = serializers.CharField(max_length=200)
     content = serializers.CharField()
-    author = serializers.EmailField(read_only=True)
+    author = serializers.EmailField(source="author.email", read_only=True)
     created_at = serializers.DateTimeField(read_only=True)
-    updated_at = serializers.DateTimeField(read_only=True, required=False)
+    updated_at = serializers.DateTimeField(read_only=True)
 
 
 class PostCreateSerializer(serializers.Serializer):
@@ -0,0 +1,58 @@
+from django.db.models import QuerySet
+
+from apps.accounts.models.user import User
+from apps.blog.models import Post
+from apps.blog.search import search_posts, update_search_vectors
+from apps.common.exceptions import ResourceNotFoundException
+from apps.common.response_cache import invalidate_response_cache
+
+POSTS_RESPONSE_CACHE_NAMESPACE = "blog.posts"
+
+
+def get_posts(query: str | None = None) -> QuerySet[Post]:
+    posts = Post.objects.select_related("author").defer("search_vector").order_by("-created_at", "-id")
+    if query:
+        return search_posts(posts, query)
+    return posts
+
+
+def get_post(post_id: int) -> Post:
+    try:
+        return get_posts().get(id=post_id)
+    except Post.DoesNotExist as exc:
+        raise ResourceNotFoundException(
+            message="Пост не найден",
+            errors=[{"code": "post_not_found", "detail": f"Пост с ID {post_id} не найден"}],
+        ) from exc
+
+
+def create_post(author: User, title: str, content: str) -> Post:
+    post = Post.objects.create(author=author, title=title, content=content)
+    update_search_vectors(Post.objects.filter(pk=post.pk))
+    invalidate_response_cache(POSTS_RESPONSE_CACHE_NAMESPACE)
+    return post
+
+
+def update_post(post: Post, title: str | None = None, content: str | None = None) -> Post:
+    update_fields = []
+
+    if title is not None and title != post.title:
+        post.title = title
+        update_fields.append("title")
+
+    if content is not None and content != post.content:
+        post.content = content
+        update_fields.append("content")
+
+    if update_fields:
+        update_fields.append("updated_at")
+        post.save(update_fields=update_fields)
+        update_search_vectors(Post.objects.filter(pk=post.pk))
+        invalidate_response_cache(POSTS_RESPONSE_CACHE_NAMESPACE)
+
+    return post
+
+
+def delete_post(post: Post) -> None:
+    post.delete()
+    invalidate_response_cache(POSTS_RESPONSE_CACHE_NAMESPACE)
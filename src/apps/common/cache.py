@@ -0,0 +1,136 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+from apps.common.metrics import record_cache_lookup
+
+LOCK_KEY = "{key}:lock"
+
+
+def is_shared_cache() -> bool:
+    # Process-local backends never see other workers' writes; callers that rely on cross-process
+    # signals (version bumps) must fall back to polling the database.
+    return not isinstance(caches["default"], LocMemCache | DummyCache)
+
+
+def new_version() -> int:
+    # Time-based versions never repeat, so an evicted version key can't resurrect a stale entry.
+    return time.time_ns()
+
+
+def get_versions(*keys: str) -> list[int]:
+    """Current value of each version key, initialising missing ones; concurrent initialisers agree via add()."""
+    versions = cache.get_many(keys)
+
+    for key in keys:
+        if key not in versions:
+            version = new_version()
+            if not cache.add(key, version, timeout=None):
+                version = cache.get(key, version)
+            versions[key] = version
+
+    return [versions[key] for key in keys]
+
+
+async def aget_versions(*keys: str) -> list[int]:
+    """See get_versions()."""
+    versions = await cache.aget_many(keys)
+
+    for key in keys:
+        if key not in versions:
+            version = new_version()
+            if not await cache.aadd(key, version, timeout=None):
+                version = await cache.aget(key, version)
+            versions[key] = version
+
+    return [versions[key] for key in keys]
+
+
+def bump_versions(*keys: str) -> None:
+    """Move the version keys forward once the current transaction commits, orphaning entries built on them."""
+    if keys:
+        transaction.on_commit(lambda: cache.set_many(dict.fromkeys(keys, new_version()), timeout=None))
+
+
+def get_or_set(key: str, loader: Callable[[], Any], timeout: int | None, name: str | None = None) -> Any:
+    """
+    Return the cached value of key, computing it with loader on a miss.
+
+    Only one caller recomputes a missing key (single-flight): it takes a short-lived lock with cache.add(),
+    the others poll for the value for up to CACHE_LOCK_TIMEOUT seconds and then compute it themselves.
+    A loader result of None is returned but not cached. With a name, hits and misses (loader calls)
+    are counted under it in the cache_lookups_total metric.
+    """
+    value = cache.get(key)
+    if value is not None:
+        _record_lookup(name, hit=True)
+        return value
+
+    lock_key = LOCK_KEY.format(key=key)
+    deadline = time.monotonic() + settings.CACHE_LOCK_TIMEOUT
+    locked = cache.add(lock_key, 1, timeout=settings.CACHE_LOCK_TIMEOUT)
+    while not locked and time.monotonic() < deadline:
+        time.sleep(settings.CACHE_LOCK_POLL_INTERVAL)
+        value = cache.get(key)
+        if value is not None:
+            _record_lookup(name, hit=True)
+            return value
+        locked = cache.add(lock_key, 1, timeout=settings.CACHE_LOCK_TIMEOUT)
+
+    try:
+        # Another caller may have filled the key between our miss and taking the lock.
+        value = cache.get(key) if locked else None
+        _record_lookup(name, hit=value is not None)
+        if value is None:
+            value = loader()
+            if value is not None:
+                cache.set(key, value, timeout)
+        return value
+    finally:
+        if locked:
+            cache.delete(lock_key)
+
+
+async def aget_or_set(
+    key: str, loader: Callable[[], Awaitable[Any]], timeout: int | None, name: str | None = None
+) -> Any:
+    """See get_or_set(); loader is a coroutine function and waiting callers don't block the event loop."""
+    value = await cache.aget(key)
+    if value is not None:
+        _record_lookup(name, hit=True)
+        return value
+
+    lock_key = LOCK_KEY.format(key=key)
+    deadline = time.monotonic() + settings.CACHE_LOCK_TIMEOUT
+    locked = await cache.aadd(lock_key, 1, timeout=settings.CACHE_LOCK_TIMEOUT)
+    while not locked and time.monotonic() < deadline:
+        await asyncio.sleep(settings.CACHE_LOCK_POLL_INTERVAL)
+        value = await cache.aget(key)
+        if value is not None:
+            _record_lookup(name, hit=True)
+            return value
+        locked = await cache.aadd(lock_key, 1, timeout=settings.CACHE_LOCK_TIMEOUT)
+
+    try:
+        value = await cache.aget(key) if locked else None
+        _record_lookup(name, hit=value is not None)
+        if value is None:
+            value = await loader()
+            if value is not None:
+                await cache.aset(key, value, timeout)
+        return value
+    finally:
+        if locked:
+            await cache.adelete(lock_key)
+
+
+def _record_lookup(name: str | None, hit: bool) -> None:
+    if name is not None:
+        record_cache_lookup(name, hit)
@@ -0,0 +1,29 @@
+from collections.abc import Iterator
+from typing import Any
+
+from django.db import connections
+from django.db.models import QuerySet
+
+
+def iterate_in_chunks(queryset: QuerySet, chunk_size: int) -> Iterator[Any]:
+    """
+    Iterate a large queryset holding at most chunk_size rows in memory.
+
+    Normally this is queryset.iterator(chunk_size), backed by a server-side cursor on PostgreSQL. Behind PgBouncer
+    in transaction mode server-side cursors are disabled (DISABLE_SERVER_SIDE_CURSORS) and the driver would fetch
+    the whole result at once, so the queryset is paged by primary key instead: one extra query per chunk.
+    Rows come in primary key order either way; prefetch_related lookups run once per chunk.
+    """
+    if not connections[queryset.db].settings_dict.get("DISABLE_SERVER_SIDE_CURSORS"):
+        yield from queryset.order_by("pk").iterator(chunk_size=chunk_size)
+        return
+
+    queryset = queryset.order_by("pk")
+    last_pk = None
+    while True:
+        page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        pks = list(page.prefetch_related(None).values_list("pk", flat=True)[:chunk_size])
+        if not pks:
+            return
+        yield from queryset.filter(pk__in=pks)
+        last_pk = pks[-1]
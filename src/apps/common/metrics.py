@@ -0,0 +1,54 @@
+import os
+
+from django.db import connections
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+
+from apps.accounts.utils.password_hashing import password_hashing_pool
+
+# With PROMETHEUS_MULTIPROC_DIR set (start.sh does it) every gunicorn worker writes its samples to files there
+# and a scrape of any worker aggregates all of them.
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by URL name",
+    ["method", "view", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+JWT_AUTH = Counter("jwt_auth_total", "JWT authentication outcomes", ["outcome"])
+CACHE_LOOKUPS = Counter("cache_lookups_total", "Cache lookups through get_or_set", ["cache", "result"])
+# Gauges of live workers are summed; a dead worker's values are dropped by child_exit in gunicorn_conf.py.
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections", "Database connection pool usage", ["state"], multiprocess_mode="livesum"
+)
+PASSWORD_HASHING_IN_FLIGHT = Gauge(
+    "password_hashing_in_flight", "Password hashes running or queued", multiprocess_mode="livesum"
+)
+
+DB_POOL_STATES = {"size": "pool_size", "available": "pool_available", "waiting": "requests_waiting"}
+
+
+def record_jwt_auth(outcome: str) -> None:
+    JWT_AUTH.labels(outcome).inc()
+
+
+def record_cache_lookup(cache_name: str, hit: bool) -> None:
+    CACHE_LOOKUPS.labels(cache_name, "hit" if hit else "miss").inc()
+
+
+def update_pool_gauges() -> None:
+    # Only DB_CONNECTION_MODE=pool has a pool; get_stats() reads counters without touching the database.
+    pool = getattr(connections["default"], "pool", None)
+    if pool is not None:
+        stats = pool.get_stats()
+        for state, stat in DB_POOL_STATES.items():
+            DB_POOL_CONNECTIONS.labels(state).set(stats.get(stat, 0))
+
+    PASSWORD_HASHING_IN_FLIGHT.set(password_hashing_pool.stats()["in_flight"])
+
+
+def render_metrics() -> bytes:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
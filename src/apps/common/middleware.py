@@ -0,0 +1,243 @@
+import logging
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from logify import django as logify_django
+from logify.core import clear_request_context, generate_request_id, info, set_request_context
+
+from apps.common.metrics import REQUEST_LATENCY, update_pool_gauges
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """execute_wrapper that counts the statements of one request, their total time and the slowest one."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest_sql = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            self.count += 1
+            self.total_ms += duration_ms
+            if duration_ms >= self.slowest_ms:
+                self.slowest_ms, self.slowest_sql = duration_ms, sql
+
+
+# Connections are per thread, and under ASGI the ORM runs in executor threads the middleware never sees.
+# Every connection gets count_request_queries instead, which finds the current request's QueryStats through
+# a context variable: sync_to_async copies the context into the thread, so the stats follow the request.
+_request_query_stats: ContextVar[QueryStats | None] = ContextVar("request_query_stats", default=None)
+
+
+def count_request_queries(execute, sql, params, many, context):
+    stats = _request_query_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    return stats(execute, sql, params, many, context)
+
+
+def install_query_counter(sender, connection, **kwargs):
+    if count_request_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_request_queries)
+
+
+class LogifyMiddleware(logify_django.LogifyMiddleware):
+    """
+    logify's request logging that can also run as async middleware.
+
+    The upstream middleware is sync-only, which makes Django run everything below it in a thread under ASGI.
+    The async path logs the same "Request started"/"Request completed" lines, reading the user through
+    request.auser(): request.user would hit the session store synchronously from the event loop.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self._should_ignore_path(request.path):
+            return await self.get_response(request)
+
+        request_id = generate_request_id()
+        request.logify_request_id = request_id
+        user_info = await self._aget_user_info(request)
+
+        info(
+            "Request started",
+            request_id=request_id,
+            service=logify_django._get_setting("SERVICE_NAME", "django-app"),
+            method=request.method,
+            path=request.path,
+            user_info=user_info,
+            headers=self._scrub_headers(dict(request.headers)),
+            query_params=dict(request.GET) if request.GET else None,
+            request_body=self._get_request_body(request),
+        )
+        set_request_context(request_id=request_id)
+
+        try:
+            response = await self.get_response(request)
+            info(
+                "Request completed",
+                request_id=request_id,
+                user_info=user_info,
+                status_code=response.status_code,
+                content_length=len(response.content) if hasattr(response, "content") else None,
+                response_body=self._get_response_body(response),
+            )
+            return response
+        finally:
+            clear_request_context()
+
+    async def _aget_user_info(self, request) -> str:
+        if hasattr(request, "auser"):
+            # request.user caches separately from auser(); share the lookup with the views below.
+            request.user = user = await request.auser()
+            if user.is_authenticated:
+                return f"User ID: {user.id}: {user.username}"
+        return "Anonymous user"
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Log the number of SQL queries, total DB time and the slowest statement of every request.
+
+    Sits right after LogifyMiddleware, so the line carries the same request_id as "Request completed".
+    A view that declares query_budget (enforced by accounts.tests.test_query_budgets) is logged as a warning when
+    the request exceeds it by more than QUERY_BUDGET_OVERHEAD, the queries authentication adds before the view runs.
+    With QUERY_INSTRUMENTATION_SERVER_TIMING the totals also go to a Server-Timing header for browser devtools.
+    Queries issued while a streaming response is consumed happen after this middleware and are not counted.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.QUERY_INSTRUMENTATION_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.ignore_paths = tuple(settings.LOG_IGNORE_PATHS)
+
+        connection_created.connect(install_query_counter, dispatch_uid="query_instrumentation")
+        for connection in connections.all(initialized_only=True):
+            install_query_counter(sender=None, connection=connection)
+
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        if request.path.startswith(self.ignore_paths):
+            return self.get_response(request)
+
+        stats = QueryStats()
+        token = _request_query_stats.set(stats)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_query_stats.reset(token)
+        return self._finish(request, response, stats)
+
+    async def __acall__(self, request):
+        if request.path.startswith(self.ignore_paths):
+            return await self.get_response(request)
+
+        stats = QueryStats()
+        token = _request_query_stats.set(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_query_stats.reset(token)
+        return self._finish(request, response, stats)
+
+    def _finish(self, request, response, stats: QueryStats):
+        self._log(request, stats)
+        if settings.QUERY_INSTRUMENTATION_SERVER_TIMING:
+            timing = f'db;dur={stats.total_ms:.1f};desc="{stats.count} queries"'
+            existing = response.get("Server-Timing")
+            response["Server-Timing"] = f"{existing}, {timing}" if existing else timing
+        return response
+
+    def _log(self, request, stats: QueryStats) -> None:
+        budget = self._get_query_budget(request)
+        over_budget = budget is not None and stats.count > budget + settings.QUERY_BUDGET_OVERHEAD
+        logger.log(
+            logging.WARNING if over_budget else logging.INFO,
+            "Query budget exceeded" if over_budget else "Request database usage",
+            extra={
+                "method": request.method,
+                "path": request.path,
+                "db_queries": stats.count,
+                "db_time_ms": round(stats.total_ms, 2),
+                "db_slowest_ms": round(stats.slowest_ms, 2),
+                "db_slowest_sql": stats.slowest_sql,
+                "query_budget": budget,
+            },
+        )
+
+    def _get_query_budget(self, request) -> int | None:
+        resolver_match = getattr(request, "resolver_match", None)
+        view_class = getattr(resolver_match.func, "view_class", None) if resolver_match else None
+        return getattr(view_class, "query_budget", None)
+
+
+class MetricsMiddleware:
+    """
+    Observe request latency per URL name for the /metrics endpoint and refresh the per-worker pool gauges.
+
+    The label is the resolved view name, not the path, so ids in URLs don't multiply the series;
+    requests that match no URL share the "unmatched" label.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        started = time.perf_counter()
+        response = self.get_response(request)
+        self._observe(request, response, started)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        self._observe(request, response, started)
+        return response
+
+    def _observe(self, request, response, started: float) -> None:
+        resolver_match = getattr(request, "resolver_match", None)
+        view = resolver_match.view_name if resolver_match else "unmatched"
+        REQUEST_LATENCY.labels(request.method, view, response.status_code).observe(time.perf_counter() - started)
+        update_pool_gauges()
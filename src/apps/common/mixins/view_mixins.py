@@ -0,0 +1,101 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.response import Response
+
+from apps.common.metrics import record_cache_lookup
+from apps.common.response_cache import get_response_cache_key
+
+
+def _set_validators(response, etag, last_modified=None):
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    # Responses are per-user: shared caches must not store them, clients must revalidate.
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+class ConditionalRetrieveMixin:
+    """
+    ETag / Last-Modified for retrieve views, derived from the object's updated_at.
+
+    The validators are checked before serialization, so a matching If-None-Match or If-Modified-Since
+    returns 304 without serializing. Views whose representation includes data that does not touch
+    updated_at extend get_etag_parts and disable get_last_modified.
+    """
+
+    def get_conditional_object(self):
+        return self.get_object()
+
+    def get_object_for_response(self, obj):
+        return obj
+
+    def get_etag_parts(self, obj) -> tuple:
+        return obj._meta.label_lower, obj.pk, obj.updated_at.isoformat()
+
+    def get_last_modified(self, obj) -> int | None:
+        return int(obj.updated_at.timestamp())
+
+    def get_etag(self, obj) -> str:
+        return '"{}"'.format(":".join(str(part) for part in self.get_etag_parts(obj)))
+
+    def retrieve(self, request, *args, **kwargs):
+        obj = self.get_conditional_object()
+        etag = self.get_etag(obj)
+        last_modified = self.get_last_modified(obj)
+
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return _set_validators(not_modified, etag, last_modified)
+
+        serializer = self.get_serializer(self.get_object_for_response(obj))
+        return _set_validators(Response(serializer.data), etag, last_modified)
+
+
+class ConditionalListMixin:
+    """
+    ETag for list views from a hash of the serialized page.
+
+    A collection has no single updated_at, and rows can disappear, so the page content is hashed instead.
+    This saves bandwidth on 304, not serialization.
+    """
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+
+        payload = json.dumps(response.data, cls=DjangoJSONEncoder, sort_keys=True).encode()
+        etag = f'"{hashlib.blake2b(payload, digest_size=16).hexdigest()}"'
+
+        not_modified = get_conditional_response(request, etag=etag)
+        return _set_validators(not_modified if not_modified is not None else response, etag)
+
+
+class CachedListMixin:
+    """
+    Cache list responses per URL, query string and the caller's permission fingerprint.
+
+    A hit is served without serializers or database queries. Writes invalidate the whole namespace through
+    apps.common.response_cache.invalidate_response_cache; RESPONSE_CACHE_TIMEOUT bounds anything missed.
+    """
+
+    response_cache_namespace: str | None = None
+
+    def list(self, request, *args, **kwargs):
+        key = get_response_cache_key(self.response_cache_namespace, request)
+
+        data = cache.get(key)
+        record_cache_lookup("responses", hit=data is not None)
+        if data is not None:
+            return Response(data)
+
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+        return response
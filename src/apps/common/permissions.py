@@ -1,80 +1,105 @@
+from collections.abc import Iterable
+
 from django.contrib.auth import get_user_model
+from django.db.models import Exists, OuterRef, QuerySet
 
-from apps.accounts.models.rbac import Permission, RolePermission, UserRole
 from apps.accounts.models.object_permission import RoleObjectPermission, UserObjectPermission
+from apps.accounts.services.rbac_service import aget_user_permission_codes, get_user_permission_codes
+from apps.accounts.utils.permission_registry import permission_registry
 
 User = get_user_model()
 
 
 def has_permission(user: User, permission_code: str) -> bool:
-    if not user or not user.is_active or user.is_deleted:
+    if not user or not user.is_active or user.is_deleted or permission_code not in permission_registry:
         return False
 
-    try:
-        permission_obj = Permission.objects.get(code=permission_code)
-    except Permission.DoesNotExist:
-        return False
+    return permission_code in get_user_permission_codes(user.id)
+
+
+def check_permissions(user: User, permission_codes: list[str]) -> dict[str, bool]:
+    if not user or not user.is_active or user.is_deleted:
+        return dict.fromkeys(permission_codes, False)
+
+    # Unknown codes are denied before the lookup, or a wildcard grant ("blog.*") would match them.
+    granted_codes = get_user_permission_codes(user.id)
+    return {
+        permission_code: permission_code in permission_registry and permission_code in granted_codes
+        for permission_code in permission_codes
+    }
 
-    user_roles = UserRole.objects.filter(user=user).select_related("role")
-    role_ids = [ur.role_id for ur in user_roles]
 
-    if not role_ids:
+async def ahas_permission(user: User, permission_code: str) -> bool:
+    if not user or not user.is_active or user.is_deleted or await permission_registry.aget(permission_code) is None:
         return False
 
-    has_role_permission = RolePermission.objects.filter(
-        role_id__in=role_ids,
-        permission=permission_obj
-    ).exists()
+    return permission_code in await aget_user_permission_codes(user.id)
 
-    return has_role_permission
 
+async def acheck_permissions(user: User, permission_codes: list[str]) -> dict[str, bool]:
+    if not user or not user.is_active or user.is_deleted:
+        return dict.fromkeys(permission_codes, False)
 
-def check_permissions(user: User, permission_codes: list[str]) -> dict[str, bool]:
-    result = {}
-    for permission_code in permission_codes:
-        result[permission_code] = has_permission(user, permission_code)
-    return result
+    granted_codes = await aget_user_permission_codes(user.id)
+    return {
+        permission_code: await permission_registry.aget(permission_code) is not None
+        and permission_code in granted_codes
+        for permission_code in permission_codes
+    }
 
 
-def check_object_permission(
+def _role_rule_filter(user: User) -> dict:
+    # Snapshot users carry their role ids, which saves the user_roles join.
+    role_ids = getattr(user, "snapshot_role_ids", None)
+    if role_ids is not None:
+        return {"role_id__in": role_ids}
+    return {"role__user_roles__user": user}
+
+
+def get_object_permission_rules(
     user: User,
     permission_code: str,
     resource_type: str,
-    resource_id: int
-) -> bool | None:
-    if not user or not user.is_active or user.is_deleted:
-        return False
+    resource_ids: Iterable[int],
+) -> dict[int, bool]:
+    """
+    Return the explicit object-level decision for every resource id that has one.
 
-    try:
-        permission_obj = Permission.objects.get(code=permission_code)
-    except Permission.DoesNotExist:
-        return None
+    A user rule wins over role rules; among the user's roles a deny wins over a grant.
+    Ids without any rule are left out, so the caller can fall back to the global permission.
+    """
+    resource_ids = list(resource_ids)
+    permission = permission_registry.get(permission_code)
+    if not resource_ids or permission is None:
+        return {}
 
-    user_obj_perm = UserObjectPermission.objects.filter(
-        user=user,
-        permission=permission_obj,
-        resource_type=resource_type,
-        resource_id=resource_id
-    ).first()
+    rule_filters = {
+        "permission_id": permission.id,
+        "resource_type": resource_type,
+        "resource_id__in": resource_ids,
+    }
 
-    if user_obj_perm:
-        return user_obj_perm.is_granted
+    rules = {}
+    role_rules = RoleObjectPermission.objects.filter(**_role_rule_filter(user), **rule_filters)
+    for resource_id, is_granted in role_rules.values_list("resource_id", "is_granted"):
+        rules[resource_id] = rules.get(resource_id, True) and is_granted
 
-    user_roles = UserRole.objects.filter(user=user).select_related("role")
-    role_ids = [ur.role_id for ur in user_roles]
+    user_rules = UserObjectPermission.objects.filter(user=user, **rule_filters)
+    rules.update(user_rules.values_list("resource_id", "is_granted"))
 
-    if role_ids:
-        role_obj_perm = RoleObjectPermission.objects.filter(
-            role_id__in=role_ids,
-            permission=permission_obj,
-            resource_type=resource_type,
-            resource_id=resource_id
-        ).first()
+    return rules
 
-        if role_obj_perm:
-            return role_obj_perm.is_granted
 
-    return None
+def check_object_permission(
+    user: User,
+    permission_code: str,
+    resource_type: str,
+    resource_id: int
+) -> bool | None:
+    if not user or not user.is_active or user.is_deleted:
+        return False
+
+    return get_object_permission_rules(user, permission_code, resource_type, [resource_id]).get(resource_id)
 
 
 def has_object_permission(
@@ -89,3 +114,55 @@ def has_object_permission(
         return obj_permission
     
     return has_permission(user, permission_code)
+
+
+def get_permitted_resource_ids(
+    user: User,
+    permission_code: str,
+    resource_type: str,
+    resource_ids: Iterable[int],
+) -> set[int]:
+    """Batch version of has_object_permission: the subset of resource_ids the user may access."""
+    if not user or not user.is_active or user.is_deleted:
+        return set()
+
+    resource_ids = set(resource_ids)
+    rules = get_object_permission_rules(user, permission_code, resource_type, resource_ids)
+    if len(rules) == len(resource_ids):
+        return {resource_id for resource_id, is_granted in rules.items() if is_granted}
+
+    default = has_permission(user, permission_code)
+    return {resource_id for resource_id in resource_ids if rules.get(resource_id, default)}
+
+
+def filter_permitted_queryset(
+    queryset: QuerySet,
+    user: User,
+    permission_code: str,
+    resource_type: str,
+    resource_id_field: str = "pk",
+) -> QuerySet:
+    """
+    Restrict queryset to the objects the user may access, in the same query.
+
+    Mirrors has_object_permission: an explicit user rule decides first, then the user's role rules
+    (a deny on any role wins), and objects without rules follow the global permission.
+    """
+    permission = permission_registry.get(permission_code)
+    if not user or not user.is_active or user.is_deleted or permission is None:
+        return queryset.none()
+
+    rule_filters = {
+        "permission_id": permission.id,
+        "resource_type": resource_type,
+        "resource_id": OuterRef(resource_id_field),
+    }
+    user_rules = UserObjectPermission.objects.filter(user=user, **rule_filters)
+    role_rules = RoleObjectPermission.objects.filter(**_role_rule_filter(user), **rule_filters)
+
+    if has_permission(user, permission_code):
+        role_allows = ~Exists(role_rules.filter(is_granted=False))
+    else:
+        role_allows = Exists(role_rules.filter(is_granted=True)) & ~Exists(role_rules.filter(is_granted=False))
+
+    return queryset.filter(Exists(user_rules.filter(is_granted=True)) | (~Exists(user_rules) & role_allows))
@@ -0,0 +1,29 @@
+import hashlib
+from urllib.parse import urlencode
+
+from apps.accounts.services.rbac_service import get_user_permission_codes
+from apps.common.cache import bump_versions, get_versions
+
+RESPONSE_CACHE_VERSION_KEY = "response-cache:{namespace}:version"
+RESPONSE_CACHE_KEY = "response-cache:{namespace}:{version}:{path}?{query}:{fingerprint}"
+
+
+def permission_fingerprint(user) -> str:
+    """Users with the same effective permission set see the same output, so they share cache entries."""
+    codes = "\n".join(sorted(get_user_permission_codes(user.id)))
+    return hashlib.blake2b(codes.encode(), digest_size=16).hexdigest()
+
+
+def get_response_cache_key(namespace: str, request) -> str:
+    return RESPONSE_CACHE_KEY.format(
+        namespace=namespace,
+        version=get_versions(RESPONSE_CACHE_VERSION_KEY.format(namespace=namespace))[0],
+        path=request.path,
+        query=urlencode(sorted(request.query_params.lists()), doseq=True),
+        fingerprint=permission_fingerprint(request.user),
+    )
+
+
+def invalidate_response_cache(namespace: str) -> None:
+    """Drop every cached response of the namespace once the current transaction commits."""
+    bump_versions(RESPONSE_CACHE_VERSION_KEY.format(namespace=namespace))
@@ -0,0 +1,101 @@
+import hashlib
+
+from rest_framework.throttling import SimpleRateThrottle
+
+
+def hash_ident(value: str) -> str:
+    # Keeps emails out of cache keys and bounds the key length.
+    return hashlib.blake2b(value.encode(), digest_size=16).hexdigest()
+
+
+class SlidingWindowRateThrottle(SimpleRateThrottle):
+    """
+    DRF throttle counting requests over a sliding window with atomic increments in the shared cache.
+
+    Each ident gets one counter per fixed window; the estimate adds the previous window's count weighted by the
+    part of it still inside the sliding window. DRF's SimpleRateThrottle rewrites a list of timestamps instead,
+    so concurrent requests on different workers overwrite each other's hits and the cache entry grows with the
+    rate. Rejected requests are counted too: a client that keeps hammering stays limited.
+
+    Subclasses set scope (a key of DEFAULT_THROTTLE_RATES; an empty rate disables the throttle) and implement
+    get_cache_key(). Views running under AsyncAPIView call aallow_request().
+    """
+
+    cache_format = "throttle:%(scope)s:%(ident)s"
+
+    def parse_rate(self, rate):
+        return super().parse_rate(rate or None)
+
+    def allow_request(self, request, view):
+        if self.num_requests is None:
+            return True
+
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+
+        current_key, previous_key = self._window_keys(key)
+        count = self._incr(current_key)
+        return self._allow(count, self.cache.get(previous_key, 0))
+
+    async def aallow_request(self, request, view):
+        if self.num_requests is None:
+            return True
+
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+
+        current_key, previous_key = self._window_keys(key)
+        count = await self._aincr(current_key)
+        return self._allow(count, await self.cache.aget(previous_key, 0))
+
+    def wait(self):
+        if self.count >= self.num_requests:
+            return self.duration - self.elapsed
+        # Time until the previous window's weight has decayed enough to let one more request in.
+        allowed_share = (self.num_requests - self.count) / self.previous_count
+        return max(0.0, (1 - allowed_share) * self.duration - self.elapsed)
+
+    def _window_keys(self, key: str) -> tuple[str, str]:
+        self.now = self.timer()
+        window, self.elapsed = divmod(self.now, self.duration)
+        return f"{key}:{int(window)}", f"{key}:{int(window) - 1}"
+
+    def _allow(self, count: int, previous_count: int) -> bool:
+        self.count, self.previous_count = count, previous_count
+        weight = 1 - self.elapsed / self.duration
+        return previous_count * weight + count <= self.num_requests
+
+    def _incr(self, key: str) -> int:
+        # The counter lives for two windows: its own and the one that weighs it as the previous window.
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            if self.cache.add(key, 1, timeout=self.duration * 2):
+                return 1
+            return self.cache.incr(key)
+
+    async def _aincr(self, key: str) -> int:
+        try:
+            return await self.cache.aincr(key)
+        except ValueError:
+            if await self.cache.aadd(key, 1, timeout=self.duration * 2):
+                return 1
+            return await self.cache.aincr(key)
+
+
+class IPRateThrottle(SlidingWindowRateThrottle):
+    def get_cache_key(self, request, view):
+        return self.cache_format % {"scope": self.scope, "ident": self.get_ident(request)}
+
+
+class EmailRateThrottle(SlidingWindowRateThrottle):
+    """Keyed by the email in the request body, so one account can't be brute-forced from many addresses."""
+
+    def get_cache_key(self, request, view):
+        data = getattr(request, "data", None)
+        email = data.get("email") if isinstance(data, dict) else None
+        if not isinstance(email, str) or not email:
+            return None
+        return self.cache_format % {"scope": self.scope, "ident": hash_ident(email.strip().lower())}
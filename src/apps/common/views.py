@@ -1,11 +1,24 @@
 
+import json
 import logging
 
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
 from django.db import connections
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
+from django.utils.crypto import constant_time_compare
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 from drf_spectacular.utils import OpenApiParameter, extend_schema
+from prometheus_client import CONTENT_TYPE_LATEST
+from rest_framework import status
+from rest_framework.exceptions import MethodNotAllowed, NotAuthenticated, ParseError, Throttled
 from rest_framework.views import APIView
 
+from apps.accounts.utils.password_hashing import password_hashing_pool
+from apps.common.metrics import render_metrics
+from config.additional.error_handling import custom_exception_handler
+
 from .serializers import HealthCheckResponseSerializer
 
 logger = logging.getLogger(__name__)
@@ -38,6 +51,7 @@ class HealthCheckView(APIView):
         overall_status = "healthy"
 
         checks["database"] = self._check_database()
+        checks["password_hashing"] = self._check_password_hashing()
 
         for _, check_result in checks.items():
             if not check_result["status"]:
@@ -64,3 +78,96 @@ class HealthCheckView(APIView):
         except Exception as e:
             logger.error(f"Database health check failed: {e}")
             return {"status": False, "message": f"Database connection failed: {str(e)}"}
+
+    def _check_password_hashing(self):
+        # A saturated pool answers 429 by design, so it is reported but never marks the service unhealthy.
+        stats = password_hashing_pool.stats()
+        return {"status": True, "message": f"{stats['in_flight']} in flight, {stats['rejected']} rejected", **stats}
+
+
+class MetricsView(View):
+    """Prometheus scrape endpoint; with METRICS_TOKEN set the scraper must send it as a bearer token."""
+
+    http_method_names = ["get"]
+
+    def get(self, request):
+        token = settings.METRICS_TOKEN
+        if token and not constant_time_compare(request.headers.get("Authorization", ""), f"Bearer {token}"):
+            return HttpResponse(status=status.HTTP_401_UNAUTHORIZED)
+        return HttpResponse(render_metrics(), content_type=CONTENT_TYPE_LATEST)
+
+
+class AsyncAPIView(View):
+    """
+    Minimal async counterpart of DRF's APIView for hot JSON endpoints served under ASGI.
+
+    DRF views are synchronous, so under ASGI every request holds a thread. Subclasses define async handlers
+    (post, ...) taking the request and the parsed JSON body and returning response data. Authentication uses
+    the aauthenticate() of authentication_classes, throttling the aallow_request() of throttle_classes, and errors
+    go through the project's exception handler, so clients see the same payloads as from the DRF views.
+    """
+
+    http_method_names = ["post"]
+    authentication_classes: list = []
+    authentication_required = False
+    throttle_classes: list = []
+    status_code = status.HTTP_200_OK
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Token-authenticated JSON API: CSRF does not apply, same as DRF's APIView.
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            handler = getattr(self, request.method.lower(), None)
+            if request.method.lower() not in self.http_method_names or handler is None:
+                raise MethodNotAllowed(request.method)
+
+            request.user, request.auth = await self.authenticate(request)
+            # Exposed like DRF's request.data, so the same throttle classes can key on the body.
+            request.data = self.parse_body(request)
+            await self.check_throttles(request)
+            data = await handler(request, request.data, *args, **kwargs)
+        except Exception as exc:
+            error_response = custom_exception_handler(exc, {"view": self, "request": request})
+            if error_response is None:
+                raise
+            response = JsonResponse(
+                error_response.data, status=error_response.status_code, json_dumps_params={"ensure_ascii": False}
+            )
+            # Retry-After, WWW-Authenticate and the like set by the exception handler.
+            for header, value in error_response.headers.items():
+                if header.lower() != "content-type":
+                    response[header] = value
+            return response
+
+        return JsonResponse(data, status=self.status_code, json_dumps_params={"ensure_ascii": False})
+
+    async def authenticate(self, request):
+        for authentication_class in self.authentication_classes:
+            result = await authentication_class().aauthenticate(request)
+            if result is not None:
+                return result
+
+        if self.authentication_required:
+            raise NotAuthenticated()
+        return AnonymousUser(), None
+
+    async def check_throttles(self, request):
+        waits = []
+        for throttle_class in self.throttle_classes:
+            throttle = throttle_class()
+            if not await throttle.aallow_request(request, self):
+                waits.append(throttle.wait())
+
+        if waits:
+            raise Throttled(wait=max(waits))
+
+    def parse_body(self, request):
+        if not request.body:
+            return {}
+        try:
+            return json.loads(request.body)
+        except ValueError as exc:
+            raise ParseError(f"JSON parse error - {exc}") from exc
@@ -2,6 +2,8 @@
 Middleware for standardized error handling.
 """
 
+import math
+
 from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import status
 from rest_framework.exceptions import (
@@ -162,7 +164,7 @@ def _handle_method_not_allowed(exc):
 
 def _handle_throttled(exc):
     """Convert Throttled to standard format."""
-    return Response(
+    response = Response(
         {
             "message": "Request throttled",
             "errors": [
@@ -176,6 +178,9 @@ def _handle_throttled(exc):
         },
         status=status.HTTP_429_TOO_MANY_REQUESTS,
     )
+    if getattr(exc, "wait", None) is not None:
+        response["Retry-After"] = str(math.ceil(exc.wait))
+    return response
 
 
 def _handle_django_validation_error(exc):
@@ -0,0 +1,8 @@
+"""Gunicorn server hooks, loaded by infra/scripts/start.sh with `-c config/gunicorn_conf.py`."""
+
+from prometheus_client import multiprocess
+
+
+def child_exit(server, worker):
+    # Drop the live gauges of a worker that exited (e.g. recycled by --max-requests); its counters stay summed.
+    multiprocess.mark_process_dead(worker.pid)
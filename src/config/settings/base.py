@@ -15,6 +15,7 @@ from datetime import timedelta
 from pathlib import Path
 
 from decouplet import config
+from django.core.exceptions import ImproperlyConfigured
 from django.templatetags.static import static
 from django.utils.translation import gettext_lazy as _
 from logify.django import get_logging_config
@@ -71,13 +72,15 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "apps.common.middleware.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "logify.django.LogifyMiddleware",
+    "apps.common.middleware.LogifyMiddleware",
+    "apps.common.middleware.QueryInstrumentationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -113,9 +116,73 @@ DATABASES = {
         "PASSWORD": config("POSTGRES_PASSWORD"),
         "HOST": config("POSTGRES_HOST"),
         "PORT": config("POSTGRES_PORT"),
+        # Drop a reused connection that the server or a proxy closed instead of failing the request on it.
+        "CONN_HEALTH_CHECKS": config("DB_CONN_HEALTH_CHECKS", cast=bool, default=True),
     },
 }
 
+# Connection reuse, DB_CONNECTION_MODE:
+# - persistent: each worker thread keeps its connection for DB_CONN_MAX_AGE seconds (0 closes it after every request);
+# - pool: psycopg 3 connection pool per process, requires the "pool" extra (psycopg[pool]);
+# - pgbouncer: persistent connections to PgBouncer in transaction pooling mode. Server-side cursors don't survive
+#   a transaction there, so they are disabled and chunked reads page through the table instead
+#   (apps.common.db.iterate_in_chunks).
+DB_CONNECTION_MODE = config("DB_CONNECTION_MODE", default="persistent")
+
+if DB_CONNECTION_MODE == "pool":
+    # Django's pool replaces persistent connections: a connection goes back to the pool after every request.
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": config("DB_POOL_MIN_SIZE", cast=int, default=2),
+            # Should cover the gunicorn threads of one worker process.
+            "max_size": config("DB_POOL_MAX_SIZE", cast=int, default=8),
+            "timeout": config("DB_POOL_TIMEOUT", cast=int, default=10),
+        },
+    }
+elif DB_CONNECTION_MODE in ("persistent", "pgbouncer"):
+    DATABASES["default"]["CONN_MAX_AGE"] = config("DB_CONN_MAX_AGE", cast=int, default=60)
+    DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = DB_CONNECTION_MODE == "pgbouncer"
+else:
+    raise ImproperlyConfigured(f"Unknown DB_CONNECTION_MODE: {DB_CONNECTION_MODE}")
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Permission, user snapshot, blacklist and response caches must be shared by all workers and replicas,
+# so production points REDIS_URL at Redis. Without it every process keeps its own in-memory cache.
+
+REDIS_URL = config("REDIS_URL", default="")
+CACHE_KEY_PREFIX = config("CACHE_KEY_PREFIX", default="effective-mobile")
+
+if REDIS_URL and not IS_TESTING:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+            "KEY_PREFIX": CACHE_KEY_PREFIX,
+            "OPTIONS": {
+                # Passed to redis-py's ConnectionPool: one pool per process, shared by its threads.
+                "max_connections": config("CACHE_MAX_CONNECTIONS", cast=int, default=50),
+                "socket_connect_timeout": config("CACHE_SOCKET_CONNECT_TIMEOUT", cast=float, default=1.0),
+                "socket_timeout": config("CACHE_SOCKET_TIMEOUT", cast=float, default=1.0),
+                "health_check_interval": 30,
+                "retry_on_timeout": True,
+            },
+        },
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "effective-mobile",
+            "KEY_PREFIX": CACHE_KEY_PREFIX,
+        },
+    }
+
+# Single-flight recompute: one process rebuilds a missing entry, the others wait up to CACHE_LOCK_TIMEOUT seconds.
+CACHE_LOCK_TIMEOUT = config("CACHE_LOCK_TIMEOUT", cast=float, default=5.0)
+CACHE_LOCK_POLL_INTERVAL = config("CACHE_LOCK_POLL_INTERVAL", cast=float, default=0.05)
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -134,6 +201,19 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing
+# PBKDF2 work factor; hashes made with another count are re-encoded on the next login.
+PASSWORD_HASH_ITERATIONS = config("PASSWORD_HASH_ITERATIONS", cast=int, default=1_000_000)
+PASSWORD_HASHERS = [
+    "apps.accounts.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+# Hashing runs in a per-worker process pool (0 = inline); calls beyond workers + queue get 429 with Retry-After.
+PASSWORD_HASHING_WORKERS = config("PASSWORD_HASHING_WORKERS", cast=int, default=1)
+PASSWORD_HASHING_QUEUE_SIZE = config("PASSWORD_HASHING_QUEUE_SIZE", cast=int, default=8)
+PASSWORD_HASHING_RETRY_AFTER = config("PASSWORD_HASHING_RETRY_AFTER", cast=int, default=2)
+
 # Session
 SESSION_COOKIE_AGE = config("SESSION_AGE", cast=int, default=15) * 60
 SESSION_SAVE_EVERY_REQUEST = False
@@ -157,6 +237,44 @@ SIMPLE_JWT = {
     "JTI_CLAIM": "jti",
 }
 
+# Token blacklist
+# Revocations made on another worker become visible within TOKEN_BLACKLIST_SYNC_INTERVAL seconds.
+TOKEN_BLACKLIST_SYNC_INTERVAL = config("TOKEN_BLACKLIST_SYNC_INTERVAL", cast=int, default=5)
+TOKEN_BLACKLIST_REBUILD_INTERVAL = config("TOKEN_BLACKLIST_REBUILD_INTERVAL", cast=int, default=60 * 60)
+TOKEN_BLACKLIST_FILTER_CAPACITY = config("TOKEN_BLACKLIST_FILTER_CAPACITY", cast=int, default=100_000)
+TOKEN_BLACKLIST_FILTER_ERROR_RATE = config("TOKEN_BLACKLIST_FILTER_ERROR_RATE", cast=float, default=0.001)
+# Expired rows are swept by `cleanup_token_blacklist` (cron/swarm) or, with an interval > 0, by a thread in each worker.
+TOKEN_BLACKLIST_CLEANUP_INTERVAL = config("TOKEN_BLACKLIST_CLEANUP_INTERVAL", cast=int, default=0)
+TOKEN_BLACKLIST_CLEANUP_BATCH_SIZE = config("TOKEN_BLACKLIST_CLEANUP_BATCH_SIZE", cast=int, default=1000)
+# Daily partitions created ahead of time once the table is partitioned (`partition_token_blacklist`).
+TOKEN_BLACKLIST_PARTITIONS_AHEAD = config("TOKEN_BLACKLIST_PARTITIONS_AHEAD", cast=int, default=8)
+
+# Opt-in: resolve request.user from a cached snapshot instead of reading the users table on every request.
+JWT_USER_SNAPSHOT_ENABLED = config("JWT_USER_SNAPSHOT_ENABLED", cast=bool, default=False)
+USER_SNAPSHOT_CACHE_TIMEOUT = config("USER_SNAPSHOT_CACHE_TIMEOUT", cast=int, default=5 * 60)
+
+# Serve login, token refresh and permission checks from async views; pays off when running under ASGI (uvicorn).
+ASYNC_AUTH_VIEWS_ENABLED = config("ASYNC_AUTH_VIEWS_ENABLED", cast=bool, default=False)
+
+# RBAC
+# Effective permission snapshots are invalidated by version bumps, the timeout only bounds memory.
+PERMISSION_CACHE_TIMEOUT = config("PERMISSION_CACHE_TIMEOUT", cast=int, default=5 * 60)
+RBAC_BULK_MAX_ITEMS = config("RBAC_BULK_MAX_ITEMS", cast=int, default=10_000)
+# Permissions created or changed on another worker become known within PERMISSION_REGISTRY_SYNC_INTERVAL seconds.
+PERMISSION_REGISTRY_SYNC_INTERVAL = config("PERMISSION_REGISTRY_SYNC_INTERVAL", cast=int, default=5)
+
+# Response cache
+# Version bumps invalidate cached list responses on write; the timeout bounds changes made elsewhere.
+RESPONSE_CACHE_TIMEOUT = config("RESPONSE_CACHE_TIMEOUT", cast=int, default=60)
+
+# Blog
+# PostgreSQL text search configuration used for post search (stemming and stop words).
+BLOG_SEARCH_CONFIG = config("BLOG_SEARCH_CONFIG", default="russian")
+
+# Admin export
+# Rows fetched per round trip from the server-side cursor while streaming an export.
+EXPORT_CHUNK_SIZE = config("EXPORT_CHUNK_SIZE", cast=int, default=2000)
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
 
@@ -221,17 +339,36 @@ REST_FRAMEWORK = {
     "PAGE_SIZE": 20,
     "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
     "EXCEPTION_HANDLER": "config.additional.error_handling.custom_exception_handler",
+    # Rates for the auth throttles (apps.accounts.throttling), counted in the shared cache; an empty value disables one.
+    "DEFAULT_THROTTLE_RATES": {
+        "login": config("THROTTLE_RATE_LOGIN", default="20/min"),
+        "login_email": config("THROTTLE_RATE_LOGIN_EMAIL", default="5/min"),
+        "register": config("THROTTLE_RATE_REGISTER", default="10/hour"),
+        "refresh": config("THROTTLE_RATE_REFRESH", default="60/min"),
+        "refresh_user": config("THROTTLE_RATE_REFRESH_USER", default="30/min"),
+    },
     "UPLOADED_FILES_USE_URL": False,
 }
 
 # Logging
+LOG_IGNORE_PATHS = [
+    "/api/v1/health/",
+    "/api/v1/schema/",
+    "/metrics",
+]
 LOGGING = get_logging_config(
     service_name="effective-mobile",
     level="INFO" if not DEBUG else "DEBUG",
     max_string_length=200,
     sensitive_fields=["password", "passwd"],
-    ignore_paths=[
-        "/api/v1/health/",
-        "/api/v1/schema/",
-    ],
+    ignore_paths=LOG_IGNORE_PATHS,
 )
+
+# Per-request SQL query count and DB time in the logs (QueryInstrumentationMiddleware).
+QUERY_INSTRUMENTATION_ENABLED = config("QUERY_INSTRUMENTATION_ENABLED", cast=bool, default=True)
+QUERY_INSTRUMENTATION_SERVER_TIMING = config("QUERY_INSTRUMENTATION_SERVER_TIMING", cast=bool, default=DEBUG)
+# A view's query_budget counts only its own queries; authentication adds up to this many on top.
+QUERY_BUDGET_OVERHEAD = config("QUERY_BUDGET_OVERHEAD", cast=int, default=2)
+
+# Prometheus scrape endpoint (/metrics); empty means no token is required, e.g. when only the internal network reaches it.
+METRICS_TOKEN = config("METRICS_TOKEN", default="")
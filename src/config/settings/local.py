@@ -27,3 +27,15 @@ SESSION_EXPIRE_AT_BROWSER_CLOSE = False
 
 CORS_ALLOW_ALL_ORIGINS = True
 SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "http")
+
+# In-process stand-in for Redis: no external services needed locally.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "effective-mobile-local",
+        "KEY_PREFIX": CACHE_KEY_PREFIX,
+    },
+}
+
+# DB time per request in the browser devtools (Network > Timing).
+QUERY_INSTRUMENTATION_SERVER_TIMING = True
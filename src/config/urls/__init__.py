@@ -19,7 +19,7 @@ from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path
 
-from apps.common.views import HealthCheckView
+from apps.common.views import HealthCheckView, MetricsView
 from config.settings import DEBUG
 from config.urls.api import api_urlpatterns
 
@@ -27,6 +27,7 @@ urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/v1/", include(api_urlpatterns)),
     path("api/health/", HealthCheckView.as_view(), name="health-check"),
+    path("metrics", MetricsView.as_view(), name="metrics"),
 ]
 
 if DEBUG: